@@ -18,14 +18,33 @@ class Settings(BaseSettings):
     DEBUG: bool = False
     HOST: str = "0.0.0.0"
     PORT: int = 8000
+    # Server worker processes; uvicorn and gunicorn both read it as their default worker count
+    WEB_CONCURRENCY: int = 1
 
     # Security
     SECRET_KEY: str = "YOUR_SUPER_SECRET_KEY"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
+    # Cached User rows for get_current_user (seconds / entries)
+    PRINCIPAL_CACHE_TTL: int = 30
+    PRINCIPAL_CACHE_MAX_ITEMS: int = 4096
+    # bcrypt cost; existing hashes are upgraded on the next successful login
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2         # processes running bcrypt
+    PASSWORD_HASH_MAX_PENDING: int = 32    # queued hashes before /auth returns 429
+    # Users allowed to read the operator endpoints (/resume/render/*/stats); nobody by default
+    OPERATOR_USERNAMES: List[str] = Field(default_factory=list)
 
     # Database
-    DATABASE_URL: str = "sqlite:///./app.db"
+    DATABASE_URL: str = "sqlite:///./test.db"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30              # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800            # seconds before a connection is reopened
+    DB_POOL_PRE_PING: bool = True
+    # SQLite only (applied on every new connection)
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
 
     # CORS
     ALLOWED_ORIGINS: List[str] = Field(
@@ -54,6 +73,19 @@ class Settings(BaseSettings):
     # Gemini
     GEMINI_API_KEY: str = ""
     GEMINI_MODEL: str = "gemini-2.5-flash-preview-05-20"
+    LLM_BACKEND: str = "gemini"            # gemini | fake (offline stand-in for tests / load runs)
+    LLM_TIMEOUT: float = 60                # seconds per attempt
+    LLM_MAX_RETRIES: int = 2
+    LLM_BACKOFF: float = 0.5               # seconds; doubled per retry, fully jittered
+    LLM_MAX_CONCURRENCY: int = 8           # model calls in flight per process
+    LLM_FAKE_RESPONSE: str = "{}"
+    LLM_FAKE_LATENCY: float = 0.0
+    # on-disk cache of résumé-parsing / CV-analysis responses; off unless set (e.g. "./llm_cache").
+    # Entries hold model output parsed from uploaded résumés (personal data) and stay on
+    # disk for LLM_CACHE_TTL; only enable it where that retention is acceptable.
+    LLM_CACHE_DIR: Optional[str] = None
+    LLM_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    LLM_CACHE_TTL: int = 7 * 24 * 3600     # seconds
 
     # Crypto
     FERNET_KEY: str = ""
@@ -64,6 +96,64 @@ class Settings(BaseSettings):
     GCS_PREFIX: str = "feedback"
     # Optional: place service-account JSON directly in env (string). If unset, ADC/GOOGLE_APPLICATION_CREDENTIALS are used.
     GCS_SA_JSON: Optional[str] = None
+    # gcs | filesystem (offline stand-in: objects under GCS_LOCAL_DIR, only ever served
+    # by the token-checked /pdf endpoint, in either PDF_DELIVERY_MODE)
+    GCS_BACKEND: str = "gcs"
+    GCS_LOCAL_DIR: str = "./local_gcs"
+    # keep-alive connections / retries of the shared GCS HTTP session
+    GCS_HTTP_POOL_SIZE: int = 16
+    GCS_HTTP_RETRIES: int = 3
+    # uploads larger than one chunk use a resumable session (multiple of 256 KiB)
+    GCS_UPLOAD_CHUNK_SIZE: int = 8 * 1024 * 1024
+    FEEDBACK_PDF_MAX_BYTES: int = 20 * 1024 * 1024
+    # signed URLs are reused until this many seconds before they expire
+    SIGNED_URL_CACHE_MAX_ITEMS: int = 4096
+    SIGNED_URL_REFRESH_MARGIN: int = 120
+    # feedback-session PDF delivery: proxy (through the API) | redirect (302 to the signed URL)
+    PDF_DELIVERY_MODE: str = "proxy"
+    # feedback-session PDF proxy (shared httpx.AsyncClient)
+    PDF_PROXY_MAX_CONCURRENCY: int = 64    # simultaneous downloads per process
+    PDF_PROXY_QUEUE_TIMEOUT: float = 10    # seconds to wait for a slot before 503
+    PDF_PROXY_MAX_CONNECTIONS: int = 32
+    PDF_PROXY_TIMEOUT: float = 30
+    # local disk copies of session PDFs; disabled when unset
+    PDF_EDGE_CACHE_DIR: Optional[str] = "./pdf_edge_cache"
+    PDF_EDGE_CACHE_MAX_BYTES: int = 1024 * 1024 * 1024
+    PDF_EDGE_CACHE_TTL: int = 3600         # seconds; bounds staleness of re-uploads made on other hosts
+
+    # ---- PDF render cache ----
+    # In-memory LRU of compiled PDFs keyed by a hash of the LaTeX source.
+    RENDER_CACHE_MAX_ITEMS: int = 256
+    RENDER_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    # Optional on-disk tier; disabled when unset.
+    RENDER_CACHE_DIR: Optional[str] = None
+    RENDER_CACHE_DISK_MAX_BYTES: int = 512 * 1024 * 1024
+
+    # ---- LaTeX render engine ----
+    LATEX_POOL_SIZE: int = 2
+    LATEX_JOB_TIMEOUT: int = 60            # seconds per pdflatex run
+    LATEX_WORKER_MAX_JOBS: int = 100       # jobs before a worker is recycled
+    LATEX_MAX_CONCURRENCY: int = 4         # async-path renders admitted to the pool queue at once
+    # Precompile common_header() into a .fmt at startup
+    LATEX_USE_FORMAT: bool = True
+
+    # ---- Background render jobs ----
+    # auto | memory | filesystem | redis. "memory" is per process: with several
+    # workers a poll landing on another worker 404s, so "auto" only picks it when
+    # WEB_CONCURRENCY is 1 and uses "filesystem" otherwise (redis across hosts).
+    RENDER_JOB_STORE: str = "auto"
+    RENDER_JOB_DIR: str = "./render_jobs"
+    RENDER_JOB_TTL: int = 3600             # seconds a job and its PDF are kept
+    REDIS_URL: str = "redis://localhost:6379/0"
+
+    # ---- CompleteResume snapshot cache (public profile only) ----
+    RESUME_CACHE_MAX_USERS: int = 1024
+    RESUME_CACHE_TTL: int = 60             # seconds; bounds staleness across workers
+
+    # ---- Extracted PDF text (uploaded résumés) ----
+    PDF_TEXT_BACKEND: str = "pymupdf"      # pymupdf | pdfminer (the other one is the fallback)
+    PDF_TEXT_CACHE_MAX_ITEMS: int = 512
+    PDF_TEXT_CACHE_TTL: int = 1800         # seconds
 
 
 settings = Settings()
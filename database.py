@@ -1,12 +1,104 @@
-from sqlalchemy import create_engine
+import threading
+from typing import Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from config import settings
+
+SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
+_url = make_url(SQLALCHEMY_DATABASE_URL)
+_is_sqlite = _url.get_backend_name() == "sqlite"
+# An in-memory SQLite database exists only inside its connection, so SQLAlchemy
+# keeps a single-connection pool for it; a QueuePool would hand each checkout
+# a fresh, empty database. Pool sizing only applies to file and server databases.
+_is_memory = _is_sqlite and (_url.database in (None, "", ":memory:") or _url.query.get("mode") == "memory")
+
+_queue_pool_args = {} if _is_memory else {
+    "pool_size": settings.DB_POOL_SIZE,
+    "max_overflow": settings.DB_MAX_OVERFLOW,
+    "pool_timeout": settings.DB_POOL_TIMEOUT,
+}
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False} if _is_sqlite else {},
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    **_queue_pool_args,
 )
+
+# Async drivers for the same database: aiosqlite locally, asyncpg for Postgres
+# (the sync engine above uses the dialect default, psycopg2 for postgresql://).
+_ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+
+def _async_url(url: str) -> str:
+    u = make_url(url)
+    backend = u.get_backend_name()
+    if u.get_driver_name() != u.get_dialect().driver or backend not in _ASYNC_DRIVERS:
+        # non-default driver (e.g. postgresql+asyncpg) or unknown backend: use as is
+        return url
+    return u.set(drivername=f"{backend}+{_ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+def _sqlite_pragmas(dbapi_conn, _):
+    # WAL lets readers run alongside the single writer instead of blocking on the file lock
+    cur = dbapi_conn.cursor()
+    cur.execute("PRAGMA journal_mode=WAL")
+    cur.execute("PRAGMA synchronous=NORMAL")
+    cur.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cur.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    cur.close()
+
+
+if _is_sqlite:
+    event.listen(engine, "connect", _sqlite_pragmas)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# ------------------------------ async engine ------------------------------
+
+_async_engine: Optional[AsyncEngine] = None
+_async_sessions: Optional[async_sessionmaker] = None
+_async_lock = threading.Lock()
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Async engine for the same database, built on first use: a backend
+    without an installed async driver then only fails the async routes,
+    not the import of this module (and with it the whole app).
+    """
+    global _async_engine, _async_sessions
+    with _async_lock:
+        if _async_engine is None:
+            async_engine = create_async_engine(
+                _async_url(SQLALCHEMY_DATABASE_URL),
+                # file-backed aiosqlite would otherwise default to NullPool
+                **({} if _is_memory else {"poolclass": AsyncAdaptedQueuePool, **_queue_pool_args}),
+                pool_recycle=settings.DB_POOL_RECYCLE,
+                pool_pre_ping=settings.DB_POOL_PRE_PING,
+            )
+            if _is_sqlite:
+                event.listen(async_engine.sync_engine, "connect", _sqlite_pragmas)
+            _async_sessions = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+            _async_engine = async_engine
+        return _async_engine
+
+
+async def dispose_async_engine() -> None:
+    # pooled aiosqlite connections each own a non-daemon thread
+    global _async_engine, _async_sessions
+    with _async_lock:
+        old, _async_engine, _async_sessions = _async_engine, None, None
+    if old is not None:
+        await old.dispose()
+
+
 Base = declarative_base()
 
 def get_db():
@@ -14,4 +106,10 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    get_async_engine()
+    async with _async_sessions() as db:
+        yield db
@@ -1,50 +1,186 @@
 # gcs.py
 from datetime import timedelta
 from typing import Optional
-import base64, json, os, mimetypes
+import base64, json, os, mimetypes, shutil, threading
 
+import google.auth
+from google.auth.credentials import with_scopes_if_required
+from google.auth.exceptions import RefreshError
+from google.auth.transport.requests import AuthorizedSession
 from google.cloud import storage
 from google.oauth2 import service_account
+from requests.adapters import HTTPAdapter
 from config import settings
+from helpers.ttl_cache import TTLCache
 
-def _build_client() -> storage.Client:
-    b64 = os.getenv("GCS_SA_JSON_B64")
-    if b64:
-        info = json.loads(base64.b64decode(b64))
-        creds = service_account.Credentials.from_service_account_info(info)
-        return storage.Client(credentials=creds, project=info.get("project_id"))
 
-    raw = os.getenv("GCS_SA_JSON")
+# ------------------------------ real client ------------------------------
+
+def _build_credentials():
+    b64 = os.getenv("GCS_SA_JSON_B64")
+    raw = base64.b64decode(b64) if b64 else os.getenv("GCS_SA_JSON")
     if raw:
         info = json.loads(raw)
         creds = service_account.Credentials.from_service_account_info(info)
-        return storage.Client(credentials=creds, project=info.get("project_id"))
+        return creds, info.get("project_id")
+
+    creds, adc_project = google.auth.default()
+    project = os.getenv("GOOGLE_CLOUD_PROJECT") or os.getenv("GCP_PROJECT") or adc_project
+    return creds, project
+
+
+def _build_client() -> storage.Client:
+    creds, project = _build_credentials()
+    creds = with_scopes_if_required(creds, storage.Client.SCOPE)
+
+    # one keep-alive pool shared by every upload / metadata call of this process
+    http = AuthorizedSession(creds)
+    adapter = HTTPAdapter(
+        pool_connections=settings.GCS_HTTP_POOL_SIZE,
+        pool_maxsize=settings.GCS_HTTP_POOL_SIZE,
+        max_retries=settings.GCS_HTTP_RETRIES,
+    )
+    http.mount("https://", adapter)
+    http.mount("http://", adapter)
+    return storage.Client(credentials=creds, project=project, _http=http)
+
+
+# ------------------------------ filesystem stand-in ------------------------------
 
-    project = os.getenv("GOOGLE_CLOUD_PROJECT") or os.getenv("GCP_PROJECT")
-    return storage.Client(project=project)
+class _LocalBlob:
+    def __init__(self, bucket: "_LocalBucket", name: str):
+        self.bucket = bucket
+        self.name = name
+        self.cache_control: Optional[str] = None
 
+    @property
+    def path(self) -> str:
+        return os.path.join(self.bucket.path, *self.name.split("/"))
 
-def make_object_name(session_id: int) -> str:
-    return f"{settings.GCS_PREFIX.strip('/')}/{session_id}/cv.pdf"
+    def exists(self) -> bool:
+        return os.path.isfile(self.path)
 
-def upload_fileobj(fileobj, bucket_name: str, object_name: str, content_type: Optional[str] = None):
-    client = _build_client()
-    bucket = client.bucket(bucket_name)
-    blob = bucket.blob(object_name)
+    def upload_from_file(self, fileobj, content_type: Optional[str] = None, **kwargs):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "wb") as f:
+            shutil.copyfileobj(fileobj, f)
+        os.replace(tmp, self.path)
 
-    try:
-        fileobj.seek(0)
-    except Exception:
+    def download_to_filename(self, filename: str, **kwargs):
+        shutil.copyfile(self.path, filename)
+
+    def delete(self, **kwargs):
+        os.remove(self.path)
+
+
+class _LocalBucket:
+    def __init__(self, root: str, name: str):
+        self.name = name
+        self.path = os.path.join(root, name)
+
+    def blob(self, name: str) -> _LocalBlob:
+        return _LocalBlob(self, name)
+
+
+class LocalStorageClient:
+    """
+    Offline stand-in for storage.Client (GCS_BACKEND=filesystem): objects live
+    under GCS_LOCAL_DIR/<bucket>/<object>. Only the calls this app makes are implemented.
+    Blobs have no generate_signed_url on purpose: object names are guessable, so the
+    files are only served by the token-checked /pdf endpoint (callers check
+    is_local_backend() first).
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def bucket(self, name: str) -> _LocalBucket:
+        return _LocalBucket(self.root, name)
+
+    def close(self):
         pass
 
+
+def is_local_backend() -> bool:
+    return settings.GCS_BACKEND == "filesystem"
+
+
+def local_object_path(bucket_name: str, object_name: str) -> str:
+    return LocalStorageClient(settings.GCS_LOCAL_DIR).bucket(bucket_name).blob(object_name).path
+
+
+# ------------------------------ shared client ------------------------------
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """
+    Process-wide client, built on first use. Credentials are parsed and the
+    HTTP pool is opened once instead of per request.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            if is_local_backend():
+                _client = LocalStorageClient(settings.GCS_LOCAL_DIR)
+            else:
+                _client = _build_client()
+        return _client
+
+
+def reset_client():
+    """
+    Drops the shared client (e.g. after credentials were rotated); the next call rebuilds it.
+    """
+    global _client
+    with _client_lock:
+        old, _client = _client, None
+    if old is not None:
+        old.close()
+    # URLs signed with the old credentials may stop working once they are revoked
+    signed_urls.clear()
+
+
+def make_object_name(session_id: int, digest: Optional[str] = None) -> str:
+    # content-addressed when the digest is known: a re-upload gets a new name
+    name = f"{digest[:16]}.pdf" if digest else "cv.pdf"
+    return f"{settings.GCS_PREFIX.strip('/')}/{session_id}/{name}"
+
+def upload_fileobj(fileobj, bucket_name: str, object_name: str, content_type: Optional[str] = None,
+                   size: Optional[int] = None):
     ct = content_type or mimetypes.guess_type(object_name)[0] or "application/pdf"
-    blob.cache_control = "public, max-age=0, no-cache"
-    blob.upload_from_file(fileobj, content_type=ct)
+
+    for attempt in (0, 1):
+        blob = get_client().bucket(bucket_name).blob(object_name)
+        try:
+            fileobj.seek(0)
+        except Exception:
+            pass
+        blob.cache_control = "public, max-age=0, no-cache"
+        if size is None or size > settings.GCS_UPLOAD_CHUNK_SIZE:
+            # resumable session, sent in chunks (a failed chunk is retried, not the whole file)
+            blob.chunk_size = settings.GCS_UPLOAD_CHUNK_SIZE
+        try:
+            blob.upload_from_file(fileobj, content_type=ct, size=size)
+            return
+        except RefreshError:
+            # stale credentials: rebuild the client once and retry
+            if attempt:
+                raise
+            reset_client()
+
+def delete_object(bucket_name: str, object_name: str):
+    get_client().bucket(bucket_name).blob(object_name).delete()
+
+def download_to_filename(bucket_name: str, object_name: str, filename: str):
+    get_client().bucket(bucket_name).blob(object_name).download_to_filename(filename)
 
 def generate_signed_url(bucket_name: str, object_name: str, expires_minutes: int = 15) -> str:
-    client = _build_client()
-    bucket = client.bucket(bucket_name)
-    blob = bucket.blob(object_name)
+    blob = get_client().bucket(bucket_name).blob(object_name)
     return blob.generate_signed_url(
         version="v4",
         expiration=timedelta(minutes=expires_minutes),
@@ -52,3 +188,41 @@ def generate_signed_url(bucket_name: str, object_name: str, expires_minutes: int
         response_disposition="inline",
         response_type="application/pdf",
     )
+
+
+# ------------------------------ signed URL cache ------------------------------
+
+class SignedUrlCache:
+    """
+    Reuses a v4 signed URL per object until `margin` seconds before it expires,
+    so byte-range requests from a PDF viewer don't each cost an RSA signature.
+    """
+
+    def __init__(self, max_items: int, margin: int):
+        self.max_items = max_items
+        self.margin = margin
+        # (bucket, object, expires_minutes) -> url, reused until `margin` before it expires
+        self._urls: TTLCache[tuple[str, str, int], str] = TTLCache(max_items)
+
+    def get(self, bucket_name: str, object_name: str, expires_minutes: int) -> str:
+        key = (bucket_name, object_name, expires_minutes)
+        url = self._urls.get(key)
+        if url is not None:
+            return url
+
+        url = generate_signed_url(bucket_name, object_name, expires_minutes=expires_minutes)
+        self._urls.put(key, url, ttl=expires_minutes * 60 - self.margin)
+        return url
+
+    def clear(self) -> None:
+        self._urls.clear()
+
+
+signed_urls = SignedUrlCache(
+    max_items=settings.SIGNED_URL_CACHE_MAX_ITEMS,
+    margin=settings.SIGNED_URL_REFRESH_MARGIN,
+)
+
+
+def cached_signed_url(bucket_name: str, object_name: str, expires_minutes: int = 15) -> str:
+    return signed_urls.get(bucket_name, object_name, expires_minutes)
@@ -0,0 +1,193 @@
+# helpers/disk_cache.py
+from __future__ import annotations
+
+import os
+import threading
+from collections import Counter
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+class DiskStore:
+    """
+    Files named by hex key under `directory` (sharded by the first two
+    characters), bounded by total bytes. Shared by the disk-backed caches
+    (render_cache, llm_cache, pdf_edge_cache), which keep their own keys,
+    expiry and counters on top.
+
+    The byte total is tracked in memory, so the directory is only walked once
+    it goes over `max_bytes`; eviction then removes the oldest files (by
+    mtime) down to LOW_WATER of the cap, skipping pinned entries. Writes go
+    through a temp file and os.replace, so readers never see a partial file.
+
+    Every method does file I/O: call them from a worker thread, not the event loop.
+    """
+
+    # eviction trims to this share of max_bytes, so the directory walk
+    # runs once per batch of writes instead of on every write at the cap
+    LOW_WATER = 0.8
+
+    def __init__(self, directory: str, suffix: str, max_bytes: int):
+        self.directory = directory
+        self.suffix = suffix
+        self.max_bytes = max_bytes
+        self.low_water_bytes = int(max_bytes * self.LOW_WATER)
+        self._lock = threading.Lock()
+        self._pins: Counter = Counter()
+        self._evicting = False
+        self._evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        self._bytes = sum(size for _, size, _ in self._entries())
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}{self.suffix}")
+
+    # ------------------------------ reads ------------------------------
+
+    def stat(self, key: str) -> Optional[os.stat_result]:
+        try:
+            return os.stat(self.path(key))
+        except OSError:
+            return None
+
+    def read(self, key: str, touch: bool = False) -> Optional[bytes]:
+        """
+        File contents, or None. `touch` bumps the mtime, so eviction treats it as recently used.
+        """
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            if touch:
+                os.utime(path)
+            return data
+        except OSError:
+            return None
+
+    # ------------------------------ writes ------------------------------
+
+    def write(self, key: str, data: bytes) -> Optional[str]:
+        def write(tmp: str) -> None:
+            with open(tmp, "wb") as f:
+                f.write(data)
+
+        return self.install(key, write)
+
+    def install(self, key: str, write: Callable[[str], None]) -> Optional[str]:
+        """
+        Stores the file `write(tmp_path)` produces under `key` and returns its
+        path, or None when it is larger than the whole store. Errors from
+        `write` propagate (the temp file is removed).
+        """
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            write(tmp)
+            size = os.path.getsize(tmp)
+            if size > self.max_bytes:
+                _remove(tmp)
+                return None
+            replaced = _size(path)
+            os.replace(tmp, path)
+        except BaseException:
+            _remove(tmp)
+            raise
+
+        with self._lock:
+            self._bytes += size - replaced
+            over = self._bytes > self.max_bytes
+        if over:
+            self._evict()
+        return path
+
+    def remove(self, key: str) -> None:
+        """
+        Deletes the entry, unless it is pinned: then eviction removes it later.
+        """
+        path = self.path(key)
+        size = _size(path)
+        with self._lock:
+            if path in self._pins:
+                return
+            try:
+                os.remove(path)
+            except OSError:
+                return
+            self._bytes -= size
+
+    # ------------------------------ pins ------------------------------
+
+    def pin(self, key: str) -> None:
+        """
+        Keeps eviction away from `key` until the matching unpin (e.g. while a response streams it).
+        """
+        with self._lock:
+            self._pins[self.path(key)] += 1
+
+    def unpin(self, key: str) -> None:
+        path = self.path(key)
+        with self._lock:
+            self._pins[path] -= 1
+            if self._pins[path] <= 0:
+                del self._pins[path]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"bytes": self._bytes, "max_bytes": self.max_bytes, "evictions": self._evictions}
+
+    # ------------------------------ eviction ------------------------------
+
+    def _entries(self) -> Iterator[Tuple[str, int, float]]:
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(self.suffix):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                yield path, st.st_size, st.st_mtime
+
+    def _evict(self) -> None:
+        with self._lock:
+            if self._evicting:
+                return
+            self._evicting = True
+        try:
+            entries = sorted(self._entries(), key=lambda e: e[2])
+            total = sum(size for _, size, _ in entries)
+            evicted = 0
+            for path, size, _ in entries:
+                if total <= self.low_water_bytes:
+                    break
+                with self._lock:
+                    # checked under the lock, so a pin taken meanwhile is honoured
+                    if path in self._pins:
+                        continue
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        continue
+                total -= size
+                evicted += 1
+            with self._lock:
+                self._bytes = total
+                self._evictions += evicted
+        finally:
+            with self._lock:
+                self._evicting = False
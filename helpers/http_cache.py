@@ -0,0 +1,51 @@
+# helpers/http_cache.py
+from __future__ import annotations
+
+import hashlib
+
+from fastapi import Request, Response
+from starlette.responses import FileResponse
+
+import schemas
+
+
+def resume_version(resume: schemas.CompleteResume) -> str:
+    """
+    Content-derived resume version: changes exactly when any entity of the resume changes,
+    and is identical across workers and restarts.
+    """
+    return hashlib.sha256(resume.model_dump_json().encode("utf-8")).hexdigest()[:32]
+
+
+def strong_etag(version: str) -> str:
+    return f'"{version}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    If-None-Match check (weak comparison, as RFC 9110 prescribes for this header).
+    Only GET and HEAD may be answered with 304; other methods never match.
+    """
+    if request.method not in ("GET", "HEAD"):
+        return False
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in header.split(","))
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+class EtagFileResponse(FileResponse):
+    """
+    FileResponse whose If-Range check also accepts the explicit ETag header
+    (Starlette only compares against its own mtime/size tag).
+    """
+
+    def _should_use_range(self, http_if_range, stat_result) -> bool:
+        return http_if_range == self.headers.get("etag") or super()._should_use_range(http_if_range, stat_result)
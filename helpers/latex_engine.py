@@ -0,0 +1,336 @@
+# helpers/latex_engine.py
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import Future
+from typing import Optional
+
+from config import settings
+from latex_template import common_header
+
+logger = logging.getLogger(__name__)
+
+FORMAT_NAME = "resume_preamble"
+JOB_NAME = "resume"
+BEGIN_DOCUMENT = r"\begin{document}"
+
+# \pdfglyphtounicode mappings live in pdfTeX's internal tables and are not
+# saved by \dump, so they have to be re-read for every job.
+_BODY_PRELUDE = "\\input{glyphtounicode}\n\\pdfgentounicode=1\n"
+
+MAX_PASSES = 3
+_RERUN_MARKERS = ("Rerun to get", "Rerun LaTeX", "Label(s) may have changed")
+
+
+class LatexCompileError(Exception):
+    pass
+
+
+def _preamble() -> str:
+    header = common_header()
+    return header[: header.index(BEGIN_DOCUMENT)]
+
+
+def build_preamble_format(fmt_dir: str) -> Optional[str]:
+    """
+    Dumps the fixed resume preamble into <fmt_dir>/resume_preamble.fmt.
+    Returns the path of the format file or None if pdflatex could not build it.
+    """
+    os.makedirs(fmt_dir, exist_ok=True)
+    src = os.path.join(fmt_dir, f"{FORMAT_NAME}.tex")
+    with open(src, "w", encoding="utf-8") as f:
+        f.write(_preamble())
+        f.write("\\dump\n")
+
+    try:
+        proc = subprocess.run(
+            ["pdflatex", "-ini", "-interaction=nonstopmode", f"-jobname={FORMAT_NAME}",
+             "&pdflatex", f"{FORMAT_NAME}.tex"],
+            cwd=fmt_dir,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            timeout=settings.LATEX_JOB_TIMEOUT,
+        )
+    except (OSError, subprocess.TimeoutExpired) as exc:
+        logger.warning("Could not build LaTeX preamble format: %s", exc)
+        return None
+
+    fmt_path = os.path.join(fmt_dir, f"{FORMAT_NAME}.fmt")
+    if proc.returncode != 0 or not os.path.exists(fmt_path):
+        logger.warning("Could not build LaTeX preamble format:\n%s",
+                       proc.stdout.decode("utf-8", errors="ignore")[-2000:])
+        return None
+    return fmt_path
+
+
+def _job_source(latex_src: str, fmt_path: Optional[str]) -> tuple[str, bool]:
+    """
+    Returns (source to write, whether it compiles against the preamble format).
+    """
+    preamble = _preamble()
+    if fmt_path and latex_src.startswith(preamble):
+        return _BODY_PRELUDE + latex_src[len(preamble):], True
+    return latex_src, False
+
+
+def _read_text(path: str) -> str:
+    try:
+        with open(path, encoding="utf-8", errors="ignore") as f:
+            return f.read()
+    except OSError:
+        return ""
+
+
+def needs_rerun(log_text: str) -> bool:
+    """
+    True if the pdflatex log asks for another pass (changed labels, page refs, ...).
+    Outlines come from the bookmark package, which writes them in the same
+    pass, so a fresh resume with no .aux/.out compiles once.
+    """
+    return any(marker in log_text for marker in _RERUN_MARKERS)
+
+
+class _Worker:
+    """
+    One pool slot: a scratch directory plus a pdflatex process that is already
+    spawned and waiting for its first input line, so a job only pays for the run.
+    """
+
+    def __init__(self, engine: "LatexEngine", index: int):
+        self.engine = engine
+        self.index = index
+        self.jobs_done = 0
+        self.workdir: Optional[str] = None
+        self.proc: Optional[subprocess.Popen] = None
+        self._reset()
+
+    def _reset(self):
+        self._discard()
+        self.workdir = tempfile.mkdtemp(prefix=f"latex-worker-{self.index}-", dir=self.engine.work_dir)
+        if self.engine.fmt_path:
+            os.symlink(self.engine.fmt_path, os.path.join(self.workdir, f"{FORMAT_NAME}.fmt"))
+        self.jobs_done = 0
+        self.proc = self._spawn()
+
+    def _discard(self):
+        if self.proc and self.proc.poll() is None:
+            self.proc.kill()
+            self.proc.wait()
+        self.proc = None
+        if self.workdir:
+            shutil.rmtree(self.workdir, ignore_errors=True)
+        self.workdir = None
+
+    def _spawn(self, use_format: bool = True) -> subprocess.Popen:
+        cmd = ["pdflatex", f"-jobname={JOB_NAME}"]
+        if use_format and self.engine.fmt_path:
+            cmd.append(f"-fmt={FORMAT_NAME}")
+        # No input file: pdflatex waits on stdin for its first line.
+        return subprocess.Popen(
+            cmd,
+            cwd=self.workdir,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        )
+
+    def _run(self, proc: subprocess.Popen) -> None:
+        try:
+            out, _ = proc.communicate(
+                input=f"\\nonstopmode\\input{{{JOB_NAME}.tex}}\n".encode(),
+                timeout=self.engine.job_timeout,
+            )
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.communicate()
+            raise LatexCompileError(f"LaTeX compilation timed out after {self.engine.job_timeout}s")
+        if proc.returncode != 0:
+            raise LatexCompileError("LaTeX compilation failed:\n" + out.decode("utf-8", errors="ignore"))
+
+    def _clean(self):
+        for name in os.listdir(self.workdir):
+            if name.startswith(f"{JOB_NAME}."):
+                os.remove(os.path.join(self.workdir, name))
+
+    def compile(self, latex_src: str) -> bytes:
+        self._clean()
+        source, use_format = _job_source(latex_src, self.engine.fmt_path)
+
+        if not use_format and self.engine.fmt_path:
+            # the warm process was started with the format; this job needs a plain one
+            self.proc.kill()
+            self.proc.wait()
+            self.proc = self._spawn(use_format=False)
+
+        with open(os.path.join(self.workdir, f"{JOB_NAME}.tex"), "w", encoding="utf-8") as f:
+            f.write(source)
+
+        try:
+            # One pass is enough unless LaTeX itself asks for a rerun
+            for i in range(MAX_PASSES):
+                proc = self.proc if i == 0 else self._spawn(use_format)
+                self.proc = None
+                self._run(proc)
+                if not needs_rerun(_read_text(os.path.join(self.workdir, f"{JOB_NAME}.log"))):
+                    break
+
+            pdf_path = os.path.join(self.workdir, f"{JOB_NAME}.pdf")
+            if not os.path.exists(pdf_path):
+                raise LatexCompileError("PDF not found after compilation.")
+            with open(pdf_path, "rb") as pdf_file:
+                return pdf_file.read()
+        finally:
+            self.jobs_done += 1
+            if self.jobs_done >= self.engine.max_jobs_per_worker:
+                self._reset()
+            else:
+                self.proc = self._spawn()
+
+    def close(self):
+        self._discard()
+
+
+class LatexEngine:
+    """
+    Pool of pdflatex workers fed from a queue. The fixed preamble from
+    common_header() is precompiled into a format once on start(), so each
+    job only typesets the document body.
+
+    compile_async() is the event-loop path: it hands the job to the same warm
+    pool and awaits the result, bounded by its own semaphore, so render bursts
+    never hold threadpool threads that the sync CRUD routes need.
+    """
+
+    def __init__(self, pool_size: int, job_timeout: int, max_jobs_per_worker: int,
+                 use_format: bool = True, work_dir: Optional[str] = None,
+                 max_concurrency: int = 4):
+        self.pool_size = max(1, pool_size)
+        self.job_timeout = job_timeout
+        self.max_jobs_per_worker = max(1, max_jobs_per_worker)
+        self.use_format = use_format
+        self.work_dir = work_dir
+        self.fmt_path: Optional[str] = None
+
+        self._jobs: "queue.Queue[Optional[tuple[str, Future]]]" = queue.Queue()
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._tmp_root: Optional[str] = None
+
+        self.max_concurrency = max(1, max_concurrency)
+        self._async_sem: Optional[asyncio.Semaphore] = None
+        self._async_waiting = 0
+        self._async_running = 0
+
+    @property
+    def started(self) -> bool:
+        return bool(self._threads)
+
+    def start(self) -> None:
+        with self._lock:
+            if self._threads:
+                return
+            if self.work_dir is None:
+                self._tmp_root = tempfile.mkdtemp(prefix="latex-engine-")
+                self.work_dir = self._tmp_root
+            os.makedirs(self.work_dir, exist_ok=True)
+            if self.use_format:
+                self.fmt_path = build_preamble_format(os.path.join(self.work_dir, "fmt"))
+            for i in range(self.pool_size):
+                t = threading.Thread(target=self._loop, args=(i,), name=f"latex-worker-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            for _ in self._threads:
+                self._jobs.put(None)
+            for t in self._threads:
+                t.join(timeout=self.job_timeout)
+            self._threads = []
+            if self._tmp_root:
+                shutil.rmtree(self._tmp_root, ignore_errors=True)
+                self._tmp_root = None
+                self.work_dir = None
+
+    def queue_depth(self) -> int:
+        return self._jobs.qsize()
+
+    def stats(self) -> dict:
+        return {
+            "pool_size": self.pool_size,
+            "pool_queue_depth": self.queue_depth(),
+            "async_limit": self.max_concurrency,
+            "async_running": self._async_running,
+            "async_waiting": self._async_waiting,
+            "format": bool(self.fmt_path),
+        }
+
+    def submit(self, latex_src: str) -> Future:
+        if not self.started:
+            self.start()
+        fut: Future = Future()
+        self._jobs.put((latex_src, fut))
+        return fut
+
+    def compile(self, latex_src: str) -> bytes:
+        return self.submit(latex_src).result()
+
+    async def compile_async(self, latex_src: str) -> bytes:
+        if not self.started:
+            await asyncio.to_thread(self.start)
+        if self._async_sem is None:
+            self._async_sem = asyncio.Semaphore(self.max_concurrency)
+
+        self._async_waiting += 1
+        try:
+            await self._async_sem.acquire()
+        finally:
+            self._async_waiting -= 1
+
+        self._async_running += 1
+        try:
+            # waits on the pool's Future without holding a thread
+            return await asyncio.wrap_future(self.submit(latex_src))
+        finally:
+            self._async_running -= 1
+            self._async_sem.release()
+
+    def _loop(self, index: int) -> None:
+        try:
+            worker = _Worker(self, index)
+        except OSError as exc:
+            logger.error("Could not start LaTeX worker %d: %s", index, exc)
+            worker = None
+
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            latex_src, fut = job
+            if not fut.set_running_or_notify_cancel():
+                continue
+            try:
+                if worker is None:
+                    worker = _Worker(self, index)
+                fut.set_result(worker.compile(latex_src))
+            except Exception as exc:
+                fut.set_exception(exc)
+
+        if worker is not None:
+            worker.close()
+
+
+latex_engine = LatexEngine(
+    pool_size=settings.LATEX_POOL_SIZE,
+    job_timeout=settings.LATEX_JOB_TIMEOUT,
+    max_jobs_per_worker=settings.LATEX_WORKER_MAX_JOBS,
+    use_format=settings.LATEX_USE_FORMAT,
+    max_concurrency=settings.LATEX_MAX_CONCURRENCY,
+)
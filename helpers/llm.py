@@ -0,0 +1,200 @@
+# helpers/llm.py
+from __future__ import annotations
+
+import asyncio
+import random
+import re
+from typing import AsyncIterator, Callable, Dict, Optional
+
+import google.generativeai as genai
+from google.api_core import exceptions as gexc
+
+from config import settings
+
+# transient upstream failures worth another attempt
+RETRYABLE = (asyncio.TimeoutError, gexc.TooManyRequests, gexc.ServerError)
+
+
+class LLMError(Exception):
+    """The model call failed after all retries or returned no text."""
+
+
+class _FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class _FakeStream:
+    def __init__(self, text: str, latency: float):
+        self.text = text
+        self.latency = latency
+
+    async def __aiter__(self):
+        # word-sized pieces, like a real token stream
+        for piece in re.findall(r"\S+\s*|\s+", self.text):
+            if self.latency:
+                await asyncio.sleep(self.latency / 20)
+            yield _FakeResponse(piece)
+
+
+class FakeModel:
+    """
+    Offline stand-in for GenerativeModel (LLM_BACKEND=fake). `responder` maps
+    (prompt, generation_config) to the response text.
+    """
+
+    def __init__(self, responder: Optional[Callable[[str, Dict], str]] = None, latency: float = 0.0):
+        self.responder = responder or (lambda prompt, config: settings.LLM_FAKE_RESPONSE)
+        self.latency = latency
+
+    async def generate_content_async(self, prompt, generation_config=None, stream=False, **kwargs):
+        text = self.responder(prompt, generation_config or {})
+        if stream:
+            return _FakeStream(text, self.latency)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return _FakeResponse(text)
+
+
+class LLMClient:
+    """
+    One configured model per process, called with generate_content_async so
+    handlers never block the event loop. Each attempt has a timeout, transient
+    errors are retried with jittered exponential backoff, and at most
+    `max_concurrency` calls are in flight.
+    """
+
+    def __init__(self, model_name: str, backend: str, timeout: float, max_retries: int,
+                 backoff: float, max_concurrency: int):
+        self.model_name = model_name
+        self.backend = backend
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_concurrency = max_concurrency
+        self._model = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    @property
+    def model(self):
+        if self._model is None:
+            if self.backend == "fake":
+                self._model = FakeModel(latency=settings.LLM_FAKE_LATENCY)
+            elif self.backend == "gemini":
+                genai.configure(api_key=settings.GEMINI_API_KEY)
+                self._model = genai.GenerativeModel(self.model_name)
+            else:
+                raise ValueError(f"Unknown LLM_BACKEND: {self.backend}")
+        return self._model
+
+    def use_model(self, model) -> None:
+        """Swap the underlying model (e.g. a FakeModel in tests)."""
+        self._model = model
+
+    async def generate(self, prompt: str, generation_config: Optional[Dict] = None) -> str:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self._slots:
+                    resp = await asyncio.wait_for(
+                        self.model.generate_content_async(
+                            prompt,
+                            generation_config=generation_config,
+                            request_options={"timeout": self.timeout},
+                        ),
+                        timeout=self.timeout,
+                    )
+                break
+            except RETRYABLE as exc:
+                if attempt == self.max_retries:
+                    raise LLMError(f"{self.model_name} failed after {attempt + 1} attempts: {exc!r}") from exc
+            except gexc.GoogleAPIError as exc:
+                raise LLMError(f"{self.model_name} request failed: {exc}") from exc
+            await self._backoff(attempt)
+
+        try:
+            text = resp.text
+        except ValueError as exc:
+            # blocked / empty candidate
+            raise LLMError(f"{self.model_name} returned no text: {exc}") from exc
+        if not text:
+            raise LLMError(f"{self.model_name} returned no text")
+        return text
+
+    async def stream(self, prompt: str, generation_config: Optional[Dict] = None) -> AsyncIterator[str]:
+        """
+        Yields text as the model produces it (generate_content_async(stream=True)).
+        Retries only happen before the first chunk; once text went out a failure is final.
+        The timeout applies to each wait for the next chunk.
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+
+        for attempt in range(self.max_retries + 1):
+            await self._slots.acquire()
+            try:
+                resp = await asyncio.wait_for(
+                    self.model.generate_content_async(
+                        prompt,
+                        generation_config=generation_config,
+                        stream=True,
+                        request_options={"timeout": self.timeout},
+                    ),
+                    timeout=self.timeout,
+                )
+                chunks = resp.__aiter__()
+                first = await asyncio.wait_for(chunks.__anext__(), timeout=self.timeout)
+                break
+            except StopAsyncIteration:
+                self._slots.release()
+                return
+            except RETRYABLE as exc:
+                self._slots.release()
+                if attempt == self.max_retries:
+                    raise LLMError(f"{self.model_name} failed after {attempt + 1} attempts: {exc!r}") from exc
+            except gexc.GoogleAPIError as exc:
+                self._slots.release()
+                raise LLMError(f"{self.model_name} request failed: {exc}") from exc
+            except BaseException:
+                self._slots.release()
+                raise
+            await self._backoff(attempt)
+
+        try:
+            chunk = first
+            while True:
+                text = _chunk_text(chunk)
+                if text:
+                    yield text
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), timeout=self.timeout)
+                except StopAsyncIteration:
+                    return
+        except (asyncio.TimeoutError, gexc.GoogleAPIError) as exc:
+            raise LLMError(f"{self.model_name} stream interrupted: {exc!r}") from exc
+        finally:
+            self._slots.release()
+
+    async def _backoff(self, attempt: int) -> None:
+        # full jitter: sleep U(0, backoff * 2^attempt)
+        await asyncio.sleep(random.uniform(0, self.backoff * (2 ** attempt)))
+
+
+def _chunk_text(chunk) -> str:
+    try:
+        return chunk.text
+    except ValueError:
+        # chunk without text parts (e.g. only finish / safety metadata)
+        return ""
+
+
+llm = LLMClient(
+    model_name=settings.GEMINI_MODEL,
+    backend=settings.LLM_BACKEND,
+    timeout=settings.LLM_TIMEOUT,
+    max_retries=settings.LLM_MAX_RETRIES,
+    backoff=settings.LLM_BACKOFF,
+    max_concurrency=settings.LLM_MAX_CONCURRENCY,
+)
@@ -0,0 +1,78 @@
+# helpers/llm_cache.py
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from config import settings
+from helpers.disk_cache import DiskStore
+
+
+class LLMResponseCache:
+    """
+    On-disk cache of model responses for deterministic prompts (résumé
+    parsing, CV analysis). Keys hash the model, the prompt template and its
+    version, the input text and the call parameters, so editing a template
+    only needs a version bump. Entries expire after `ttl`; total size is
+    bounded by `max_bytes` (a DiskStore, oldest written evicted first).
+    Off unless LLM_CACHE_DIR is set: entries keep personal data from the
+    résumés on disk for up to `ttl`.
+
+    get/put do file I/O: call them from a worker thread, not the event loop.
+    """
+
+    def __init__(self, directory: Optional[str], max_bytes: int, ttl: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0}
+        self._store = DiskStore(directory, ".txt", max_bytes) if directory else None
+
+    @staticmethod
+    def key_for(model: str, template: str, version: str, text: str, params: Dict[str, Any]) -> str:
+        payload = json.dumps({
+            "model": model,
+            "template": template,
+            "version": version,
+            "text": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+            "params": params,
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        if not self._store:
+            return None
+        data = None
+        st = self._store.stat(key)
+        if st is not None and st.st_mtime + self.ttl < time.time():
+            self._store.remove(key)
+        elif st is not None:
+            data = self._store.read(key)
+        with self._lock:
+            self._counters["hits" if data is not None else "misses"] += 1
+        return data.decode("utf-8") if data is not None else None
+
+    def put(self, key: str, text: str) -> None:
+        if not self._store:
+            return
+        try:
+            self._store.write(key, text.encode("utf-8"))
+        except OSError:
+            pass
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            out = dict(self._counters)
+        out.update(self._store.stats() if self._store else {"bytes": 0, "max_bytes": 0, "evictions": 0})
+        return out
+
+
+llm_cache = LLMResponseCache(
+    directory=settings.LLM_CACHE_DIR,
+    max_bytes=settings.LLM_CACHE_MAX_BYTES,
+    ttl=settings.LLM_CACHE_TTL,
+)
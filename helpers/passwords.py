@@ -0,0 +1,94 @@
+# helpers/passwords.py
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache
+from typing import Optional
+
+from passlib.context import CryptContext
+
+# Nothing app-level is imported here: pool workers are spawned and import only this module.
+
+
+class HashingBusy(Exception):
+    """Raised when every hashing slot (running + queued) is taken."""
+
+
+@lru_cache(maxsize=None)
+def _context(rounds: int) -> CryptContext:
+    # min == max == default, so any hash made with another cost "needs update"
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
+
+
+def _hash(password: str, rounds: int) -> str:
+    return _context(rounds).hash(password)
+
+
+def _verify_and_update(plain: str, hashed: str, rounds: int) -> tuple[bool, Optional[str]]:
+    try:
+        return _context(rounds).verify_and_update(plain, hashed)
+    except (ValueError, TypeError):
+        # empty / foreign hash (e.g. accounts created through Google)
+        return False, None
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a small process pool so it never holds the GIL of the API
+    process. At most `workers + max_pending` operations are in flight; beyond
+    that callers get HashingBusy instead of an ever-growing queue.
+    """
+
+    def __init__(self, rounds: int, workers: int, max_pending: int):
+        self.rounds = rounds
+        self.workers = workers
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn, not fork: the API process already runs threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _submit(self, fn, *args) -> Future:
+        if not self._slots.acquire(blocking=False):
+            raise HashingBusy()
+        try:
+            fut = self._pool().submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        fut.add_done_callback(lambda _: self._slots.release())
+        return fut
+
+    async def hash(self, password: str) -> str:
+        # awaiting the pool's Future holds no threadpool thread
+        return await asyncio.wrap_future(self._submit(_hash, password, self.rounds))
+
+    async def verify_and_update(self, plain: str, hashed: str) -> tuple[bool, Optional[str]]:
+        """
+        Returns (ok, new_hash); new_hash is set when the stored hash was made
+        with a different cost and should replace it.
+        """
+        return await asyncio.wrap_future(self._submit(_verify_and_update, plain, hashed, self.rounds))
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
@@ -0,0 +1,178 @@
+# helpers/pdf_edge_cache.py
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from config import settings
+from helpers.disk_cache import DiskStore
+
+_READ_CHUNK = 1024 * 1024
+
+
+class PdfEdgeCache:
+    """
+    Local disk copies of uploaded feedback-session PDFs keyed by object name,
+    so viewers are served from disk (Range / ETag included) instead of GCS.
+    Bounded by total bytes (a DiskStore, oldest written evicted first);
+    entries older than `ttl` are dropped so replacements made through another
+    host show up.
+
+    lookup() pins the entry it returns, so eviction leaves the file alone
+    until release() is called once the response has been sent.
+    """
+
+    def __init__(self, directory: Optional[str], max_bytes: int, ttl: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # path -> ((inode, mtime_ns, size), etag); recomputed whenever the file is replaced
+        self._etags: Dict[str, tuple[tuple[int, int, int], str]] = {}
+        # object name -> set once the download in progress for it has finished
+        self._filling: Dict[str, threading.Event] = {}
+        self._counters = {"hits": 0, "misses": 0, "fills": 0}
+        self._store = DiskStore(directory, ".pdf", max_bytes) if directory else None
+
+    @property
+    def enabled(self) -> bool:
+        return self._store is not None
+
+    @staticmethod
+    def _key(object_name: str) -> str:
+        return hashlib.sha256(object_name.encode("utf-8")).hexdigest()
+
+    # ------------------------------ lookup ------------------------------
+
+    def lookup(self, object_name: str) -> Optional[tuple[str, str, os.stat_result]]:
+        """
+        Returns (path, strong etag, stat) of the cached copy, or None.
+        A hit stays pinned until release(object_name).
+        """
+        if not self.enabled:
+            return None
+        key = self._key(object_name)
+        self._store.pin(key)
+        entry = None
+        try:
+            entry = self._entry(key)
+        finally:
+            if entry is None:
+                self._store.unpin(key)
+        with self._lock:
+            self._counters["hits" if entry else "misses"] += 1
+        return entry
+
+    def release(self, object_name: str) -> None:
+        if self.enabled:
+            self._store.unpin(self._key(object_name))
+
+    def _entry(self, key: str) -> Optional[tuple[str, str, os.stat_result]]:
+        st = self._store.stat(key)
+        if st is None or st.st_mtime + self.ttl < time.time():
+            return None
+
+        path = self._store.path(key)
+        stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+        with self._lock:
+            known = self._etags.get(path)
+        if known is not None and known[0] == stamp:
+            return path, known[1], st
+
+        # written by another process (or before a restart): hash it once
+        h = hashlib.sha256()
+        try:
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(_READ_CHUNK), b""):
+                    h.update(chunk)
+        except OSError:
+            return None
+        etag = f'"{h.hexdigest()[:32]}"'
+        with self._lock:
+            self._etags[path] = (stamp, etag)
+        return path, etag, st
+
+    # ------------------------------ population ------------------------------
+
+    def put_file(self, object_name: str, fileobj, digest: Optional[str] = None) -> None:
+        """
+        Copies an open file (e.g. the upload being stored) into the cache.
+        `digest` is its sha256 hex when already known, which saves re-hashing it.
+        """
+        if not self.enabled:
+            return
+        try:
+            fileobj.seek(0)
+        except Exception:
+            pass
+        path = self._install(object_name, lambda tmp: self._copy(fileobj, tmp))
+        if path and digest:
+            try:
+                st = os.stat(path)
+            except OSError:
+                return
+            with self._lock:
+                self._etags[path] = ((st.st_ino, st.st_mtime_ns, st.st_size), f'"{digest[:32]}"')
+
+    def fill(self, object_name: str, download: Callable[[str], None]) -> None:
+        """
+        Fills the entry with `download(tmp_path)`. Concurrent fills of one
+        object share a single download: later callers wait for the first.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            done = self._filling.get(object_name)
+            first = done is None
+            if first:
+                done = self._filling[object_name] = threading.Event()
+        if not first:
+            done.wait()
+            return
+        try:
+            self._install(object_name, download)
+        finally:
+            with self._lock:
+                self._filling.pop(object_name, None)
+            done.set()
+
+    def invalidate(self, object_name: str) -> None:
+        if not self.enabled:
+            return
+        key = self._key(object_name)
+        self._store.remove(key)
+        with self._lock:
+            self._etags.pop(self._store.path(key), None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            out = dict(self._counters)
+        if self.enabled:
+            out.update(self._store.stats())
+        return out
+
+    # ------------------------------ internals ------------------------------
+
+    @staticmethod
+    def _copy(fileobj, tmp: str) -> None:
+        with open(tmp, "wb") as f:
+            shutil.copyfileobj(fileobj, f, _READ_CHUNK)
+
+    def _install(self, object_name: str, write: Callable[[str], None]) -> Optional[str]:
+        path = self._store.install(self._key(object_name), write)
+        if path:
+            with self._lock:
+                self._etags.pop(path, None)
+                self._counters["fills"] += 1
+        return path
+
+
+pdf_edge_cache = PdfEdgeCache(
+    directory=settings.PDF_EDGE_CACHE_DIR,
+    max_bytes=settings.PDF_EDGE_CACHE_MAX_BYTES,
+    ttl=settings.PDF_EDGE_CACHE_TTL,
+)
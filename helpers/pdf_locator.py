@@ -0,0 +1,228 @@
+# helpers/pdf_locator.py
+from __future__ import annotations
+
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import fitz  # PyMuPDF
+
+_STRIP = re.compile(r"[^\w+#]")
+# get_text("words") keeps "Python/Django," and "Kafka-based" together; index their parts
+_PIECE = re.compile(r"[^\s/,\-\u2013\u2014]+")
+
+
+def _token(word: str) -> str:
+    # case/width-insensitive, punctuation dropped ("Python," == "python", "C++" stays "c++")
+    return _STRIP.sub("", unicodedata.normalize("NFKC", word).casefold())
+
+
+def phrase_tokens(phrase: str) -> List[str]:
+    return [t for t in (_token(w) for w in _PIECE.findall(phrase)) if t]
+
+
+def _edits_allowed(length: int) -> int:
+    # short tokens must match exactly: one edit turns "rust" into "must", "react" into "reach"
+    return 0 if length < 6 else 1 if length < 10 else 2
+
+
+def _within(a: str, b: str, limit: int) -> bool:
+    """
+    Optimal string alignment distance(a, b) <= limit; an adjacent swap
+    ("pyhton") counts as one edit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return False
+    if limit == 0:
+        return a == b
+    before, prev = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], before[j - 2] + 1)
+        if min(cur) > limit:
+            return False
+        before, prev = prev, cur
+    return prev[-1] <= limit
+
+
+def _similar(word: str, token: str) -> bool:
+    return word == token or _within(word, token, _edits_allowed(min(len(word), len(token))))
+
+
+Box = Tuple[float, float, float, float]
+
+
+def _pieces(text: str, box: Box) -> List[Tuple[str, Box]]:
+    """
+    Splits a printed word on / , - and dashes. Each piece gets its share of
+    the word's box in proportion to its character offsets.
+    """
+    x0, y0, x1, y1 = box
+    width = (x1 - x0) / max(len(text), 1)
+    return [(m.group(), (x0 + m.start() * width, y0, x0 + m.end() * width, y1))
+            for m in _PIECE.finditer(text)]
+
+
+class _Word(NamedTuple):
+    token: str
+    page: int
+    # ((block_no, line_no), (x0, y0, x1, y1)) per printed piece; two when hyphenated across lines
+    parts: Tuple[Tuple[Tuple[int, int], Box], ...]
+
+
+class PdfPhraseIndex:
+    """
+    An opened PDF plus a token index over the words of its first `max_pages`
+    pages, built once from page.get_text("words") (analyze_cv does that in a
+    worker thread while the model is still answering). PyMuPDF is not
+    thread-safe, so all work on `doc` must stay on one thread at a time.
+
+    Phrases are matched token by token, so they are found across line breaks
+    and end-of-line hyphenation. Words are indexed in pieces split on / , -
+    and dashes, so "Kafka" is found inside "Kafka/RabbitMQ". In phrases of several words each longer
+    token tolerates a typo or two (see _edits_allowed), since the model does
+    not always quote the CV verbatim; single-word phrases match exactly.
+    Phrases longer than MAX_PHRASE are cut, and then their last token only
+    needs to be a prefix. Each occurrence yields one merged rect per line.
+    A phrase the index cannot place (part of a word, such as "ngineers") falls
+    back to page.search_for, but only on pages where each of its tokens occurs
+    within an indexed word.
+    """
+
+    MAX_PHRASE = 64  # safety limit on note phrases
+
+    def __init__(self, pdf_bytes: bytes, max_pages: int,
+                 on_open: Optional[Callable[[fitz.Document], None]] = None):
+        self.doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+        if on_open is not None:
+            # extra work on the open document before indexing, on this same thread
+            on_open(self.doc)
+        self.page_count = min(self.doc.page_count, max_pages)
+        self._words: List[_Word] = []
+        self._positions: Dict[str, List[int]] = defaultdict(list)
+        self._variants: Dict[str, Set[str]] = {}
+        self._substring_pages: Dict[str, Set[int]] = {}
+        for page_num in range(self.page_count):
+            self._add_page(page_num, self.doc[page_num].get_text("words"))
+
+    def _add_page(self, page_num: int, words: Iterable[tuple]) -> None:
+        pending = None  # "multi-" at a line end, waiting for "disciplinary"
+        for x0, y0, x1, y1, text, block_no, line_no, _ in words:
+            line = (block_no, line_no)
+            hyphenated = len(text) > 1 and text.endswith("-")
+            pieces = _pieces(text, (x0, y0, x1, y1))
+            if pending is not None:
+                head, head_part = pending
+                pending = None
+                if head_part[0] != line and pieces:
+                    first, box = pieces.pop(0)
+                    self._append(head + first, page_num, (head_part, (line, box)))
+                else:
+                    self._append(head, page_num, (head_part,))
+            if hyphenated and pieces:
+                head, box = pieces.pop()
+                pending = (head, (line, box))
+            for piece, box in pieces:
+                self._append(piece, page_num, ((line, box),))
+        if pending is not None:
+            self._append(pending[0], page_num, (pending[1],))
+
+    def _append(self, text: str, page_num: int, parts) -> None:
+        token = _token(text)
+        if token:
+            self._positions[token].append(len(self._words))
+            self._words.append(_Word(token, page_num, parts))
+
+    # ------------------------------ lookups ------------------------------
+
+    def locate(self, phrase: str) -> List[Tuple[int, fitz.Rect]]:
+        """
+        (page index, rect) per line of every occurrence of `phrase`.
+        """
+        cut = len(phrase) > self.MAX_PHRASE
+        tokens = phrase_tokens(phrase[:self.MAX_PHRASE])
+        if not tokens:
+            # nothing to look up in the index (punctuation only): plain search
+            return self._search(phrase[:self.MAX_PHRASE], range(self.page_count))
+
+        if len(tokens) == 1:
+            # a lone word has no neighbours to confirm a fuzzy hit
+            allowed = [{tokens[0]}]
+        else:
+            allowed = [self._similar_words(t) for t in tokens]
+        # every match starts with a word similar to the first token
+        starts = sorted(pos for word in allowed[0] for pos in self._positions.get(word, ()))
+        hits: List[Tuple[int, fitz.Rect]] = []
+        for start in starts:
+            if self._matches(start, tokens, allowed, cut):
+                hits.extend(self._merge(self._words[start:start + len(tokens)]))
+        if hits:
+            return hits
+        return self._search(phrase[:self.MAX_PHRASE], self._pages_containing(tokens))
+
+    def locate_all(self, phrases: Iterable[str]) -> Dict[str, List[Tuple[int, fitz.Rect]]]:
+        return {phrase: self.locate(phrase) for phrase in set(phrases)}
+
+    def _search(self, phrase: str, pages: Iterable[int]) -> List[Tuple[int, fitz.Rect]]:
+        return [(page_num, rect)
+                for page_num in pages
+                for rect in self.doc[page_num].search_for(phrase)]
+
+    def _pages_containing(self, tokens: List[str]) -> List[int]:
+        """
+        Pages where every token occurs inside some indexed word: the only pages
+        on which search_for can find the phrase. Empty for a phrase the PDF
+        does not contain, so made-up notes cost no page scans.
+        """
+        pages: Optional[Set[int]] = None
+        for token in sorted(set(tokens), key=len, reverse=True):  # long tokens rule out most
+            found = self._substring_pages.get(token)
+            if found is None:
+                found = {self._words[pos].page
+                         for word, positions in self._positions.items() if token in word
+                         for pos in positions}
+                self._substring_pages[token] = found
+            pages = found if pages is None else pages & found
+            if not pages:
+                return []
+        return sorted(pages)
+
+    def _similar_words(self, token: str) -> Set[str]:
+        """
+        Indexed words within typo distance of `token` (memoized per index).
+        """
+        words = self._variants.get(token)
+        if words is None:
+            words = {w for w in self._positions if _similar(w, token)}
+            self._variants[token] = words
+        return words
+
+    def _matches(self, start: int, tokens: List[str], allowed: List[Set[str]], cut: bool) -> bool:
+        words = self._words[start:start + len(tokens)]
+        if len(words) < len(tokens):
+            return False
+        if all(w.token in ok for w, ok in zip(words, allowed)):
+            return True
+        # a cut phrase may end in the middle of its last word
+        tail = words[-1].token
+        return (cut and len(tokens) > 1 and tail.startswith(tokens[-1])
+                and all(w.token in ok for w, ok in zip(words[:-1], allowed)))
+
+    @staticmethod
+    def _merge(words: List[_Word]) -> List[Tuple[int, fitz.Rect]]:
+        merged: Dict[Tuple[int, Tuple[int, int]], Box] = {}
+        for w in words:
+            for line, box in w.parts:
+                key = (w.page, line)
+                if key in merged:
+                    x0, y0, x1, y1 = merged[key]
+                    box = (min(x0, box[0]), min(y0, box[1]), max(x1, box[2]), max(y1, box[3]))
+                merged[key] = box
+        return [(page, fitz.Rect(box)) for (page, _), box in merged.items()]
+
+    def close(self) -> None:
+        self.doc.close()
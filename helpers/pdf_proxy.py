@@ -0,0 +1,119 @@
+# helpers/pdf_proxy.py
+from __future__ import annotations
+
+import asyncio
+from typing import Optional
+
+import httpx
+from fastapi import HTTPException, Request
+from starlette.background import BackgroundTask
+from starlette.responses import StreamingResponse
+
+from config import settings
+
+# forwarded so pdf.js range reads keep working through the proxy
+REQUEST_HEADERS = ("range", "if-range")
+RESPONSE_HEADERS = ("Content-Type", "Content-Length", "Accept-Ranges", "Content-Range",
+                    "ETag", "Last-Modified", "Cache-Control")
+CHUNK_SIZE = 256 * 1024
+
+
+class UpstreamProxy:
+    """
+    Streams remote objects (signed GCS URLs) to clients over one pooled
+    httpx.AsyncClient. At most `max_concurrency` downloads run at once; the
+    upstream response is closed as soon as the client goes away.
+    """
+
+    def __init__(self, max_concurrency: int, queue_timeout: float, max_connections: int, timeout: float):
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def _ensure(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def stream(self, url: str, request: Request, cache_control: Optional[str] = None) -> StreamingResponse:
+        """
+        `cache_control` replaces the upstream Cache-Control header when given.
+        """
+        client = self._ensure()
+        # identity encoding keeps Content-Length / Content-Range valid for the raw bytes
+        headers = {"Accept-Encoding": "identity"}
+        for h in REQUEST_HEADERS:
+            if h in request.headers:
+                headers[h] = request.headers[h]
+
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise HTTPException(503, "Too many PDF downloads in progress",
+                                headers={"Retry-After": "1"})
+
+        upstream: Optional[httpx.Response] = None
+        released = False
+
+        async def cleanup():
+            # runs from the body generator and again as a background task, whichever comes first
+            nonlocal released
+            if upstream is not None:
+                await upstream.aclose()
+            if not released:
+                released = True
+                self._slots.release()
+
+        try:
+            upstream = await client.send(client.build_request("GET", url, headers=headers), stream=True)
+        except httpx.HTTPError:
+            await cleanup()
+            raise HTTPException(502, "Failed to fetch PDF")
+        except BaseException:
+            # cancelled while connecting (client went away) or anything else: do not leak the slot
+            await cleanup()
+            raise
+        if upstream.status_code not in (200, 206):
+            await cleanup()
+            raise HTTPException(upstream.status_code, "Failed to fetch PDF")
+
+        async def body():
+            try:
+                async for chunk in upstream.aiter_raw(CHUNK_SIZE):
+                    yield chunk
+            finally:
+                await cleanup()
+
+        passthrough = {h: upstream.headers[h] for h in RESPONSE_HEADERS if h in upstream.headers}
+        if cache_control is not None:
+            passthrough["Cache-Control"] = cache_control
+        return StreamingResponse(
+            body(),
+            status_code=upstream.status_code,
+            headers=passthrough,
+            media_type=upstream.headers.get("Content-Type", "application/pdf"),
+            background=BackgroundTask(cleanup),
+        )
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+pdf_proxy = UpstreamProxy(
+    max_concurrency=settings.PDF_PROXY_MAX_CONCURRENCY,
+    queue_timeout=settings.PDF_PROXY_QUEUE_TIMEOUT,
+    max_connections=settings.PDF_PROXY_MAX_CONNECTIONS,
+    timeout=settings.PDF_PROXY_TIMEOUT,
+)
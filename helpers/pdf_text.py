@@ -0,0 +1,105 @@
+# helpers/pdf_text.py
+from __future__ import annotations
+
+import hashlib
+import io
+import threading
+from typing import Dict, Optional
+
+import fitz  # PyMuPDF
+from pdfminer.high_level import extract_text
+
+from config import settings
+from helpers.ttl_cache import TTLCache
+
+
+class PdfTextCache:
+    """
+    Extracted text of uploaded PDFs keyed by sha256 of the file bytes, so the
+    same résumé sent to the analyzer, the cover-letter generator and the
+    importer is parsed once. LRU bounded by item count, entries expire after `ttl`.
+    """
+
+    def __init__(self, max_items: int, ttl: int):
+        self.max_items = max_items
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._items: TTLCache[str, str] = TTLCache(max_items, ttl)
+        self._counters = {"hits": 0, "misses": 0}
+
+    @staticmethod
+    def key_for(pdf_bytes: bytes) -> str:
+        return hashlib.sha256(pdf_bytes).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        text = self._items.get(key)
+        with self._lock:
+            self._counters["hits" if text is not None else "misses"] += 1
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        self._items.put(key, text)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters, items=len(self._items), max_items=self.max_items)
+
+
+pdf_text_cache = PdfTextCache(
+    max_items=settings.PDF_TEXT_CACHE_MAX_ITEMS,
+    ttl=settings.PDF_TEXT_CACHE_TTL,
+)
+
+
+# ------------------------------ extraction backends ------------------------------
+
+def _extract_pymupdf(pdf_bytes: bytes, doc: Optional[fitz.Document] = None) -> str:
+    if doc is not None:
+        # form feed between pages, like pdfminer
+        return "\f".join(page.get_text("text") for page in doc)
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        return _extract_pymupdf(pdf_bytes, doc)
+
+
+def _extract_pdfminer(pdf_bytes: bytes, doc: Optional[fitz.Document] = None) -> str:
+    return extract_text(io.BytesIO(pdf_bytes))
+
+
+EXTRACTORS = {
+    "pymupdf": _extract_pymupdf,
+    "pdfminer": _extract_pdfminer,
+}
+
+
+def extract_pdf_text(pdf_bytes: bytes, doc: Optional[fitz.Document] = None) -> str:
+    """
+    Extract raw text from a PDF file (uncached). PDF_TEXT_BACKEND is tried
+    first; the other backends are used when it fails or finds no text.
+    `doc` is the same file already opened with PyMuPDF by the calling thread.
+    """
+    preferred = settings.PDF_TEXT_BACKEND
+    if preferred not in EXTRACTORS:
+        raise ValueError(f"Unknown PDF_TEXT_BACKEND: {preferred}")
+    order = [preferred] + [name for name in EXTRACTORS if name != preferred]
+
+    error: Optional[Exception] = None
+    for name in order:
+        try:
+            text = EXTRACTORS[name](pdf_bytes, doc)
+        except Exception as exc:
+            error = error or exc
+            continue
+        if text.strip():
+            return text
+    if error is not None:
+        raise error
+    return ""
+
+
+def pdf_to_text(pdf_bytes: bytes, doc: Optional[fitz.Document] = None) -> str:
+    key = pdf_text_cache.key_for(pdf_bytes)
+    text = pdf_text_cache.get(key)
+    if text is None:
+        text = extract_pdf_text(pdf_bytes, doc)
+        pdf_text_cache.put(key, text)
+    return text
@@ -0,0 +1,113 @@
+# helpers/render_cache.py
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from typing import Dict, Optional
+
+from config import settings
+from helpers.disk_cache import DiskStore
+from helpers.ttl_cache import TTLCache
+
+
+class RenderCache:
+    """
+    Content-addressed cache of compiled PDFs.
+    Keys are sha256 of the LaTeX source; values are the PDF bytes.
+    Memory tier is a TTLCache (no expiry) bounded by item count and total bytes,
+    the optional disk tier is a DiskStore (oldest mtime evicted first; reads refresh it).
+    """
+
+    def __init__(
+        self,
+        max_items: int,
+        max_bytes: int,
+        disk_dir: Optional[str] = None,
+        disk_max_bytes: int = 0,
+    ):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+
+        self._lock = threading.Lock()
+        self._mem: TTLCache[str, bytes] = TTLCache(max_items, max_size=max_bytes)
+        self._counters = {
+            "hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+        }
+        self._disk = DiskStore(disk_dir, ".pdf", disk_max_bytes) if disk_dir else None
+
+    # ------------------------------ keys ------------------------------
+
+    @staticmethod
+    def key_for(latex_src: str) -> str:
+        return hashlib.sha256(latex_src.encode("utf-8")).hexdigest()
+
+    # ------------------------------ api ------------------------------
+
+    def get(self, key: str) -> Optional[bytes]:
+        data = self._mem.get(key)
+        if data is not None:
+            with self._lock:
+                self._counters["hits"] += 1
+            return data
+
+        data = self._disk_get(key)
+        with self._lock:
+            self._counters["disk_hits" if data is not None else "misses"] += 1
+        if data is not None:
+            self._mem.put(key, data)
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        self._mem.put(key, data)
+        self._disk_put(key, data)
+
+    def clear(self) -> None:
+        self._mem.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            out = dict(self._counters)
+        out.update(
+            evictions=self._mem.evictions,
+            items=len(self._mem),
+            bytes=self._mem.size,
+            max_items=self.max_items,
+            max_bytes=self.max_bytes,
+        )
+        disk = self._disk.stats() if self._disk else {"bytes": 0, "max_bytes": 0, "evictions": 0}
+        out.update(
+            disk_bytes=disk["bytes"],
+            disk_max_bytes=disk["max_bytes"],
+            disk_evictions=disk["evictions"],
+        )
+        return out
+
+    # ------------------------------ disk tier ------------------------------
+
+    def _disk_get(self, key: str) -> Optional[bytes]:
+        if not self._disk:
+            return None
+        return self._disk.read(key, touch=True)  # mark as recently used
+
+    def _disk_put(self, key: str, data: bytes) -> None:
+        if not self._disk or len(data) > self.disk_max_bytes:
+            return
+        if os.path.exists(self._disk.path(key)):
+            return
+        try:
+            self._disk.write(key, data)
+        except OSError:
+            pass
+
+
+render_cache = RenderCache(
+    max_items=settings.RENDER_CACHE_MAX_ITEMS,
+    max_bytes=settings.RENDER_CACHE_MAX_BYTES,
+    disk_dir=settings.RENDER_CACHE_DIR,
+    disk_max_bytes=settings.RENDER_CACHE_DISK_MAX_BYTES,
+)
@@ -0,0 +1,253 @@
+# helpers/render_jobs.py
+from __future__ import annotations
+
+import abc
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from typing import Dict, Optional
+
+from config import settings
+from helpers.latex_engine import latex_engine
+from helpers.render_cache import render_cache
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+FINISHED = (DONE, FAILED)
+
+logger = logging.getLogger(__name__)
+
+
+# ------------------------------ result stores ------------------------------
+
+class ResultStore(abc.ABC):
+    """
+    Keeps job records (dicts) and finished PDFs for `ttl` seconds.
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+
+    @abc.abstractmethod
+    def save_job(self, job: Dict) -> None:
+        ...
+
+    @abc.abstractmethod
+    def load_job(self, job_id: str) -> Optional[Dict]:
+        ...
+
+    @abc.abstractmethod
+    def save_pdf(self, job_id: str, data: bytes) -> None:
+        ...
+
+    @abc.abstractmethod
+    def load_pdf(self, job_id: str) -> Optional[bytes]:
+        ...
+
+
+class MemoryResultStore(ResultStore):
+    def __init__(self, ttl: int):
+        super().__init__(ttl)
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, tuple[float, Dict]] = {}
+        self._pdfs: Dict[str, tuple[float, bytes]] = {}
+
+    def _purge(self):
+        now = time.time()
+        for table in (self._jobs, self._pdfs):
+            for k in [k for k, (exp, _) in table.items() if exp < now]:
+                del table[k]
+
+    def save_job(self, job):
+        with self._lock:
+            self._purge()
+            self._jobs[job["id"]] = (time.time() + self.ttl, dict(job))
+
+    def load_job(self, job_id):
+        with self._lock:
+            self._purge()
+            entry = self._jobs.get(job_id)
+            return dict(entry[1]) if entry else None
+
+    def save_pdf(self, job_id, data):
+        with self._lock:
+            self._pdfs[job_id] = (time.time() + self.ttl, data)
+
+    def load_pdf(self, job_id):
+        with self._lock:
+            self._purge()
+            entry = self._pdfs.get(job_id)
+            return entry[1] if entry else None
+
+
+class FileResultStore(ResultStore):
+    def __init__(self, ttl: int, directory: str):
+        super().__init__(ttl)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, job_id: str, ext: str) -> str:
+        return os.path.join(self.directory, f"{job_id}.{ext}")
+
+    def _write(self, path: str, data: bytes):
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def _read(self, path: str) -> Optional[bytes]:
+        try:
+            if os.path.getmtime(path) + self.ttl < time.time():
+                os.remove(path)
+                return None
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _purge(self):
+        cutoff = time.time() - self.ttl
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def save_job(self, job):
+        self._purge()
+        self._write(self._path(job["id"], "json"), json.dumps(job).encode("utf-8"))
+
+    def load_job(self, job_id):
+        raw = self._read(self._path(job_id, "json"))
+        return json.loads(raw) if raw else None
+
+    def save_pdf(self, job_id, data):
+        self._write(self._path(job_id, "pdf"), data)
+
+    def load_pdf(self, job_id):
+        return self._read(self._path(job_id, "pdf"))
+
+
+class RedisResultStore(ResultStore):
+    """
+    Shares jobs between processes/hosts. Needs a reachable Redis server at
+    REDIS_URL; use "filesystem" for a single host without one.
+    """
+
+    def __init__(self, ttl: int, url: str):
+        super().__init__(ttl)
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError("RENDER_JOB_STORE=redis requires the 'redis' package") from exc
+        self._redis = redis.Redis.from_url(url)
+
+    def save_job(self, job):
+        self._redis.setex(f"render-job:{job['id']}", self.ttl, json.dumps(job))
+
+    def load_job(self, job_id):
+        raw = self._redis.get(f"render-job:{job_id}")
+        return json.loads(raw) if raw else None
+
+    def save_pdf(self, job_id, data):
+        self._redis.setex(f"render-job:{job_id}:pdf", self.ttl, data)
+
+    def load_pdf(self, job_id):
+        return self._redis.get(f"render-job:{job_id}:pdf")
+
+
+def build_result_store() -> ResultStore:
+    kind = settings.RENDER_JOB_STORE
+    if kind == "auto":
+        # job state must be visible to every worker that may serve the poll
+        kind = "memory" if settings.WEB_CONCURRENCY <= 1 else "filesystem"
+    elif kind == "memory" and settings.WEB_CONCURRENCY > 1:
+        logger.warning("RENDER_JOB_STORE=memory with %d workers: job polls that reach another "
+                       "worker return 404", settings.WEB_CONCURRENCY)
+    if kind == "memory":
+        return MemoryResultStore(settings.RENDER_JOB_TTL)
+    if kind == "filesystem":
+        return FileResultStore(settings.RENDER_JOB_TTL, settings.RENDER_JOB_DIR)
+    if kind == "redis":
+        return RedisResultStore(settings.RENDER_JOB_TTL, settings.REDIS_URL)
+    raise ValueError(f"Unknown RENDER_JOB_STORE: {kind}")
+
+
+# ------------------------------ job manager ------------------------------
+
+class RenderJobs:
+    """
+    Submits LaTeX sources to the render engine's worker pool and records
+    their progress in a ResultStore, so clients can poll instead of waiting.
+    """
+
+    def __init__(self, store: ResultStore):
+        self.store = store
+        self._lock = threading.Lock()
+        self._live: Dict[str, Future] = {}
+
+    def submit(self, owner_id: int, latex_src: str) -> Dict:
+        job = {
+            "id": uuid.uuid4().hex,
+            "owner_id": owner_id,
+            "status": QUEUED,
+            "error": None,
+            "created_at": time.time(),
+            "finished_at": None,
+        }
+
+        key = render_cache.key_for(latex_src)
+        cached = render_cache.get(key)
+        if cached is not None:
+            self._finish(job, pdf=cached)
+            return job
+
+        self.store.save_job(job)
+        submitted = dict(job)
+        fut = latex_engine.submit(latex_src)
+        with self._lock:
+            self._live[job["id"]] = fut
+        fut.add_done_callback(lambda f: self._on_done(job, key, f))
+        return submitted
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        job = self.store.load_job(job_id)
+        if job and job["status"] == QUEUED:
+            with self._lock:
+                fut = self._live.get(job_id)
+            if fut is not None and fut.running():
+                job["status"] = RUNNING
+        return job
+
+    def get_pdf(self, job_id: str) -> Optional[bytes]:
+        return self.store.load_pdf(job_id)
+
+    def _on_done(self, job: Dict, key: str, fut: Future):
+        with self._lock:
+            self._live.pop(job["id"], None)
+        exc = fut.exception()
+        if exc is not None:
+            self._finish(job, error=str(exc))
+            return
+        pdf = fut.result()
+        render_cache.put(key, pdf)
+        self._finish(job, pdf=pdf)
+
+    def _finish(self, job: Dict, pdf: Optional[bytes] = None, error: Optional[str] = None):
+        if pdf is not None:
+            self.store.save_pdf(job["id"], pdf)
+        job["status"] = FAILED if error else DONE
+        job["error"] = error
+        job["finished_at"] = time.time()
+        self.store.save_job(job)
+
+
+render_jobs = RenderJobs(build_result_store())
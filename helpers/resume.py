@@ -1,66 +1,116 @@
-import os
-import subprocess
-
+from sqlalchemy import bindparam, cast, literal, null, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 import models
 import schemas
 from latex_template import generate_latex_from_complete_resume
-import tempfile
 from fastapi.responses import StreamingResponse
 from helpers.sort_resume import sort_resume_inplace
+from helpers.latex_engine import latex_engine
+from helpers.resume_cache import resume_snapshots
+
+# CompleteResume key -> (model, read schema); the whole resume is fetched in one
+# round-trip with a UNION ALL over these tables.
+_RESUME_PARTS = {
+    "general": (models.General, schemas.GeneralRead),
+    "workExperience": (models.WorkExperience, schemas.WorkExperienceRead),
+    "projects": (models.Project, schemas.ProjectRead),
+    "education": (models.Education, schemas.EducationRead),
+    "achievements": (models.Achievement, schemas.AchievementRead),
+    "skills": (models.Skill, schemas.SkillRead),
+    "contacts": (models.Contact, schemas.ContactRead),
+}
+
+
+def _union_columns() -> dict:
+    """
+    Every column of every part table, name -> type of its first occurrence.
+    Derived from the models, so a new column joins the union by itself.
+    """
+    columns = {}
+    for model, _ in _RESUME_PARTS.values():
+        for column in model.__table__.columns:
+            columns.setdefault(column.name, column.type)
+    return columns
+
+
+_UNION_COLUMNS = _union_columns()
+
+
+def _build_resume_query(enabled_only: bool):
+    user_id = bindparam("user_id")
+    branches = []
+    for kind, (model, _) in _RESUME_PARTS.items():
+        own = model.__table__.columns
+        cols = [literal(kind).label("kind")]
+        for name, type_ in _UNION_COLUMNS.items():
+            if name not in own:
+                col = cast(null(), type_)
+            elif own[name].type._type_affinity is type_._type_affinity:
+                col = own[name]
+            else:
+                # same name, different type in another table: align it for the UNION
+                col = cast(own[name], type_)
+            cols.append(col.label(name))
+        stmt = select(*cols).where(model.user_id == user_id)
+        if enabled_only and "is_disabled" in own:
+            stmt = stmt.where(model.is_disabled == False)
+        branches.append(stmt)
+    union = union_all(*branches).subquery()
+    return select(union).order_by(union.c.kind, union.c.id)
+
+
+# built once: constructing the 7-branch statement costs more than running it on SQLite
+_RESUME_QUERIES = {enabled_only: _build_resume_query(enabled_only) for enabled_only in (False, True)}
+
+
+def _resume_from_rows(rows) -> schemas.CompleteResume:
+    parts = {kind: [] for kind in _RESUME_PARTS}
+    for row in rows:
+        model, schema = _RESUME_PARTS[row["kind"]]
+        parts[row["kind"]].append(schema.model_validate({c.name: row[c.name] for c in model.__table__.columns}))
+
+    general = parts.pop("general")
+    return schemas.CompleteResume(general=general[0] if general else None, **parts)
+
+
+def _load_complete_resume(user_id: int, db: Session, enabled_only: bool) -> schemas.CompleteResume:
+    return _resume_from_rows(db.execute(_RESUME_QUERIES[enabled_only], {"user_id": user_id}).mappings())
+
+
+async def _load_complete_resume_async(user_id: int, db: AsyncSession, enabled_only: bool) -> schemas.CompleteResume:
+    result = await db.execute(_RESUME_QUERIES[enabled_only], {"user_id": user_id})
+    return _resume_from_rows(result.mappings())
+
+
+# Owner reads always hit the database: snapshot invalidation only reaches the
+# local worker, so a cached owner read could show a pre-edit resume or PDF for
+# up to RESUME_CACHE_TTL after a write handled by another worker.
 
 def get_complete_resume_with_enabled_entities(user_id: int, db: Session):
-    general = db.query(models.General).filter(models.General.user_id == user_id).first()
-    work_experiences = db.query(models.WorkExperience).filter(
-        models.WorkExperience.user_id == user_id,
-        models.WorkExperience.is_disabled == False
-    ).all()
-    projects = db.query(models.Project).filter(
-        models.Project.user_id == user_id,
-        models.Project.is_disabled == False
-    ).all()
-    education = db.query(models.Education).filter(
-        models.Education.user_id == user_id,
-        models.Education.is_disabled == False
-    ).all()
-    achievements = db.query(models.Achievement).filter(
-        models.Achievement.user_id == user_id,
-        models.Achievement.is_disabled == False
-    ).all()
-    skills = db.query(models.Skill).filter(
-        models.Skill.user_id == user_id,
-        models.Skill.is_disabled == False
-    ).all()
-    contacts = db.query(models.Contact).filter(models.Contact.user_id == user_id).all()
-
-    return schemas.CompleteResume(
-        general=schemas.GeneralRead.from_orm(general) if general else None,
-        workExperience=[schemas.WorkExperienceRead.from_orm(w) for w in work_experiences],
-        projects=[schemas.ProjectRead.from_orm(p) for p in projects],
-        education=[schemas.EducationRead.from_orm(e) for e in education],
-        achievements=[schemas.AchievementRead.from_orm(a) for a in achievements],
-        skills=[schemas.SkillRead.from_orm(s) for s in skills],
-        contacts=[schemas.ContactRead.from_orm(c) for c in contacts],
-    )
+    # contacts and general have no is_disabled flag and are always included
+    return _load_complete_resume(user_id, db, enabled_only=True)
 
 def get_complete_resume(user_id: int, db: Session):
-    general = db.query(models.General).filter(models.General.user_id == user_id).first()
-    work_experiences = db.query(models.WorkExperience).filter(models.WorkExperience.user_id == user_id).all()
-    projects = db.query(models.Project).filter(models.Project.user_id == user_id).all()
-    education = db.query(models.Education).filter(models.Education.user_id == user_id).all()
-    achievements = db.query(models.Achievement).filter(models.Achievement.user_id == user_id).all()
-    skills = db.query(models.Skill).filter(models.Skill.user_id == user_id).all()
-    contacts = db.query(models.Contact).filter(models.Contact.user_id == user_id).all()
-
-    return schemas.CompleteResume(
-        general=schemas.GeneralRead.from_orm(general) if general else None,
-        workExperience=[schemas.WorkExperienceRead.from_orm(w) for w in work_experiences],
-        projects=[schemas.ProjectRead.from_orm(p) for p in projects],
-        education=[schemas.EducationRead.from_orm(e) for e in education],
-        achievements=[schemas.AchievementRead.from_orm(a) for a in achievements],
-        skills=[schemas.SkillRead.from_orm(s) for s in skills],
-        contacts=[schemas.ContactRead.from_orm(c) for c in contacts],
-    )
+    return _load_complete_resume(user_id, db, enabled_only=False)
+
+
+async def get_complete_resume_async(user_id: int, db: AsyncSession, enabled_only: bool = False):
+    return await _load_complete_resume_async(user_id, db, enabled_only)
+
+
+async def get_public_resume_async(user_id: int, db: AsyncSession):
+    """
+    The public profile's resume, served from the snapshot cache: a visitor may
+    see an edit up to RESUME_CACHE_TTL late when another worker handled it.
+    """
+    resume = resume_snapshots.get(user_id, False)
+    if resume is not None:
+        return resume
+    generation = resume_snapshots.generation(user_id)
+    resume = await _load_complete_resume_async(user_id, db, enabled_only=False)
+    resume_snapshots.put(user_id, False, resume, generation)
+    return resume
 
 
 
@@ -69,24 +119,10 @@ def render_my_cv(db: Session, current_user: models.User):
     sort_resume_inplace(resume_data)
 
     latex_output = generate_latex_from_complete_resume(resume_data)
+    pdf_bytes = latex_engine.compile(latex_output)
 
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tex_path = os.path.join(tmpdir, "resume.tex")
-        with open(tex_path, "w", encoding="utf-8") as f:
-            f.write(latex_output)
-
-        for _ in range(2):
-            subprocess.run(
-                ["pdflatex", "-interaction=nonstopmode", "resume.tex"],
-                cwd=tmpdir,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                check=True,
-            )
-
-        pdf_path = os.path.join(tmpdir, "resume.pdf")
-        return StreamingResponse(
-            open(pdf_path, "rb"),
-            media_type="application/pdf",
-            headers={"Content-Disposition": f"inline; filename=resume_{current_user.id}.pdf"},
-        )
+    return StreamingResponse(
+        iter([pdf_bytes]),
+        media_type="application/pdf",
+        headers={"Content-Disposition": f"inline; filename=resume_{current_user.id}.pdf"},
+    )
@@ -0,0 +1,63 @@
+# helpers/resume_cache.py
+from __future__ import annotations
+
+import threading
+from typing import Optional
+
+import schemas
+from config import settings
+from helpers.ttl_cache import TTLCache
+
+
+class ResumeSnapshotCache:
+    """
+    Per-user snapshots of CompleteResume for the public profile (owner reads
+    bypass it). Resume write handlers call invalidate_resume(); the TTL bounds
+    staleness across processes, since invalidation only reaches the local one.
+    """
+
+    def __init__(self, max_users: int, ttl: int):
+        self.max_users = max_users
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # (user_id, enabled_only) -> resume
+        self._snapshots: TTLCache[tuple[int, bool], schemas.CompleteResume] = TTLCache(max_users * 2, ttl)
+        # bumped on every invalidation so a load that raced with a write is not stored
+        self._generations: dict[int, int] = {}
+
+    # ------------------------------ snapshots ------------------------------
+
+    def generation(self, user_id: int) -> int:
+        with self._lock:
+            return self._generations.get(user_id, 0)
+
+    def get(self, user_id: int, enabled_only: bool) -> Optional[schemas.CompleteResume]:
+        resume = self._snapshots.get((user_id, enabled_only))
+        if resume is None:
+            return None
+        # callers sort the lists in place, so never hand out the cached object
+        return resume.model_copy(deep=True)
+
+    def put(self, user_id: int, enabled_only: bool, resume: schemas.CompleteResume, generation: int) -> None:
+        snapshot = resume.model_copy(deep=True)
+        with self._lock:
+            # checked and stored under one lock, so an invalidate() cannot slip in between
+            if self._generations.get(user_id, 0) != generation:
+                return
+            self._snapshots.put((user_id, enabled_only), snapshot)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+            self._snapshots.pop((user_id, True))
+            self._snapshots.pop((user_id, False))
+
+
+resume_snapshots = ResumeSnapshotCache(
+    max_users=settings.RESUME_CACHE_MAX_USERS,
+    ttl=settings.RESUME_CACHE_TTL,
+)
+
+
+def invalidate_resume(user_id: int) -> None:
+    resume_snapshots.invalidate(user_id)
@@ -0,0 +1,87 @@
+# helpers/ttl_cache.py
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Thread-safe in-memory LRU shared by the process-local caches (rendered
+    PDFs, signed URLs, PDF text, principals, resume snapshots). Bounded by
+    item count and, when `max_size` is set, by the total `size_of` of the
+    values; entries expire `ttl` seconds after they were put (never when
+    None). Expired entries are dropped when they are looked up.
+    """
+
+    def __init__(
+        self,
+        max_items: int,
+        ttl: Optional[float] = None,
+        max_size: Optional[int] = None,
+        size_of: Callable[[V], int] = len,
+    ):
+        self.max_items = max_items
+        self.ttl = ttl
+        self.max_size = max_size
+        self.size_of = size_of
+        self.size = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        # key -> (expires_at or None, size, value)
+        self._items: "OrderedDict[K, tuple[Optional[float], int, V]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: K) -> Optional[V]:
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                return None
+            if entry[0] is not None and entry[0] <= time.monotonic():
+                self._drop(key)
+                return None
+            self._items.move_to_end(key)
+            return entry[2]
+
+    def put(self, key: K, value: V, ttl: Optional[float] = None) -> None:
+        """
+        Stores `value`; `ttl` overrides the cache-wide one for this entry.
+        Values larger than max_size on their own are not stored.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        size = self.size_of(value) if self.max_size is not None else 0
+        with self._lock:
+            if self.max_size is not None and size > self.max_size:
+                return
+            self._drop(key)
+            self._items[key] = (None if ttl is None else time.monotonic() + ttl, size, value)
+            self.size += size
+            while self._items and (
+                len(self._items) > self.max_items
+                or (self.max_size is not None and self.size > self.max_size)
+            ):
+                _, (_, evicted, _) = self._items.popitem(last=False)
+                self.size -= evicted
+                self.evictions += 1
+
+    def pop(self, key: K) -> None:
+        with self._lock:
+            self._drop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.size = 0
+
+    def _drop(self, key: K) -> None:
+        # caller holds the lock
+        entry = self._items.pop(key, None)
+        if entry is not None:
+            self.size -= entry[1]
@@ -1,23 +1,27 @@
 # import_resume.py
-import os, json, io, re
+import json, re
 from typing import Dict
-from pdfminer.high_level import extract_text
-import google.generativeai as genai
-from google.generativeai import GenerativeModel
 from fastapi import File
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
 import models
+from helpers.llm import llm
+from helpers.llm_cache import llm_cache
+from helpers.pdf_text import pdf_to_text
+from helpers.resume_cache import invalidate_resume
 
-genai.configure(api_key=os.getenv("GEMINI_API_KEY")) 
+def _pdf_to_text(pdf_bytes: bytes) -> str:
+    """Extract raw text from a PDF file (cached by content hash)."""
+    return pdf_to_text(pdf_bytes)
 
-MODEL_NAME = os.getenv("GEMINI_MODEL", "gemini-2.5-flash-preview-05-20")
+# bump when the prompt below changes, so cached responses are not reused
+RESUME_PROMPT_VERSION = "1"
+
+JSON_MODE = {"response_mime_type": "application/json"}
 
-def _pdf_to_text(pdf_bytes: bytes) -> str:
-    """Extract raw text from a PDF file."""
-    return extract_text(io.BytesIO(pdf_bytes))
 
-def _ask_gemini_for_json(resume_text: str) -> Dict:
+async def _ask_gemini_for_json(resume_text: str) -> Dict:
     """
     Calls Gemini in JSON-mode and returns a python dict that
     matches your CompleteResume schema.
@@ -54,15 +58,21 @@ Return nothing else.
 RESUME TEXT
 {resume_text}
 """
-    model = GenerativeModel(model_name=MODEL_NAME)
-    resp = model.generate_content(
-        prompt, generation_config={"response_mime_type": "application/json"}
-    )
+    key = llm_cache.key_for(llm.model_name, "resume_import", RESUME_PROMPT_VERSION,
+                            resume_text, JSON_MODE)
+    text = await run_in_threadpool(llm_cache.get, key)
+    cached = text is not None
+    if not cached:
+        text = await llm.generate(prompt, generation_config=JSON_MODE)
     # Gemini sometimes wraps JSON in markdown fences – strip them:
-    m = re.search(r"\{.*\}", resp.text, re.S)
+    m = re.search(r"\{.*\}", text, re.S)
     if not m:
         raise ValueError("Could not locate JSON in Gemini response")
-    return json.loads(m.group(0))
+    parsed = json.loads(m.group(0))
+    if not cached:
+        # only responses that parsed are worth replaying
+        await run_in_threadpool(llm_cache.put, key, text)
+    return parsed
 
 
 
@@ -92,6 +102,7 @@ def import_resume_from_json(user: models.User, data: Dict, db: Session):
     _sync_list(models.Contact,         data.get("contacts", []),
                ["media"], user, db)
     db.commit()
+    invalidate_resume(user.id)
 
 
 
@@ -155,3 +166,4 @@ def replace_resume_from_json(user: models.User, data: Dict, db: Session):
     _bulk(models.Contact,        "contacts")
 
     db.commit()
+    invalidate_resume(user.id)
@@ -16,6 +16,7 @@ def common_header() -> str:
 \usepackage{verbatim}
 \usepackage{enumitem}
 \usepackage[hidelinks]{hyperref}
+\usepackage{bookmark}
 \usepackage{fancyhdr}
 \usepackage{tabularx}
 \usepackage[T2A]{fontenc}
@@ -6,9 +6,12 @@ from starlette.middleware.sessions import SessionMiddleware
 from configs.oauth import oauth
 from config import settings
 import os
-from database import Base, engine
+from database import Base, dispose_async_engine, engine
 from routers import auth, users, sections, blocks, resume
 from routers import cover_letter, cv_analyzer
+from helpers.latex_engine import latex_engine
+from utils import password_hasher
+from helpers.pdf_proxy import pdf_proxy
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
@@ -50,6 +53,31 @@ app.include_router(cv_analyzer.router)
 app.include_router(cover_letter.router)
 app.include_router(resume.router)
 
+@app.on_event("startup")
+def start_latex_engine():
+    # Precompile the LaTeX preamble and spawn render workers once per process
+    latex_engine.start()
+
+
+@app.on_event("shutdown")
+def stop_latex_engine():
+    latex_engine.shutdown()
+
+
+@app.on_event("shutdown")
+def stop_password_hasher():
+    password_hasher.shutdown()
+
+
+@app.on_event("shutdown")
+async def close_pdf_proxy():
+    await pdf_proxy.aclose()
+
+
+@app.on_event("shutdown")
+async def close_async_engine():
+    await dispose_async_engine()
+
 # Root endpoint
 @app.get("/")
 async def root():
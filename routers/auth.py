@@ -3,7 +3,7 @@ from fastapi import APIRouter
 import os
 from configs.oauth import oauth
 
-from utils import get_password_hash, verify_password, create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES, get_current_user
+from utils import get_password_hash, verify_password_and_update, create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES, get_current_user, forget_principal
 
 from datetime import timedelta
 from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
@@ -11,24 +11,29 @@ from fastapi import Response
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi.responses import RedirectResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from authlib.integrations.starlette_client import OAuthError
 from fastapi import Request
-from database import engine, Base, get_db
+from database import engine, Base, get_async_db, get_db
 import models
 import schemas
 from models import User
+from helpers.resume_cache import invalidate_resume
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
 
 @router.post("/register", response_model=schemas.UserRead)
-def register_user(user_in: schemas.UserCreate, db: Session = Depends(get_db)):
-    existing = db.query(User).filter(User.email == user_in.email).first()
+async def register_user(user_in: schemas.UserCreate, db: AsyncSession = Depends(get_async_db)):
+    existing = (await db.execute(select(User).where(User.email == user_in.email))).scalars().first()
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
+    # end the read transaction: no pooled connection is held while bcrypt runs
+    await db.commit()
 
-    hashed_password = get_password_hash(user_in.password)
+    hashed_password = await get_password_hash(user_in.password)
     user = User(
         email=user_in.email,
         hashed_password=hashed_password,
@@ -38,28 +43,35 @@ def register_user(user_in: schemas.UserCreate, db: Session = Depends(get_db)):
         github=user_in.github
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     return user
 
 
 @router.post("/login", response_model=schemas.Token)
-def login_for_access_token(
+async def login_for_access_token(
     response: Response,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = db.query(User).filter(User.email == form_data.username).first()
+    user = (await db.execute(select(User).where(User.email == form_data.username))).scalars().first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
         )
-    if not verify_password(form_data.password, user.hashed_password):
+    await db.commit()  # release the connection while bcrypt runs (see register_user)
+    ok, new_hash = await verify_password_and_update(form_data.password, user.hashed_password)
+    if not ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
         )
+    if new_hash:
+        # BCRYPT_ROUNDS changed since this hash was made
+        user.hashed_password = new_hash
+        await db.commit()
+        forget_principal(user.id)
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(data={"sub": str(user.id)}, expires_delta=access_token_expires)
     return schemas.Token(access_token=access_token, token_type="bearer")
@@ -135,6 +147,7 @@ async def auth_google_callback(request: Request, db: Session = Depends(get_db)):
         user.name = user_info.get('name', '')
         user.photo_url = user_info.get('picture')
         db.commit()
+        forget_principal(user.id)
         db.refresh(user)
         # Ensure the user's General info has a fullName
         general = db.query(models.General).filter(models.General.user_id == user.id).first()
@@ -155,6 +168,7 @@ async def auth_google_callback(request: Request, db: Session = Depends(get_db)):
             )
             db.add(general)
             db.commit()
+    invalidate_resume(user.id)
 
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(data={"sub": str(user.id)}, expires_delta=access_token_expires)
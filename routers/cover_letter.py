@@ -1,7 +1,7 @@
 # routers/cover_letter.py
 from typing import Literal, Optional
 
-import os, re, io, json
+import json
 from fastapi import APIRouter, Depends, File, Form, UploadFile, HTTPException
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
@@ -10,12 +10,10 @@ from database import get_db
 from utils import get_current_user        # same helper you already use
 import models
 
-# ─── Gemini / OpenAI setup ───────────────────────────────────────────────
-import google.generativeai as genai
-from google.generativeai import GenerativeModel
-
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-MODEL_NAME = os.getenv("GEMINI_MODEL", "gemini-2.5-flash-preview-05-20")
+# ─── Gemini (shared async client) ────────────────────────────────────────
+from helpers.llm import LLMError, llm
+from starlette.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 
 # ─── Re‑use the pdf → text helper from import_resume.py ──────────────────
 from import_resume import _pdf_to_text    # already written earlier
@@ -27,9 +25,58 @@ class CoverLetterOut(BaseModel):
     letter: str
 
 
-@router.post("/generate", response_model=CoverLetterOut,
-             summary="Generate a tailored cover letter via Gemini")
-async def generate_cover_letter(
+# ─── Markdown fence stripping (works on whole texts and on streams) ──────
+class FenceStripper:
+    """
+    Drops an opening ```lang line and a closing ``` line from text that
+    arrives in pieces. Text that could still turn out to be a fence is held
+    back until the next piece (or finish()) decides it.
+    """
+
+    _FENCE_PREFIXES = ("", "`", "``", "```")
+
+    def __init__(self):
+        self._head_done = False
+        self._buf = ""
+
+    def feed(self, piece: str) -> str:
+        self._buf += piece
+        if not self._head_done:
+            probe = self._buf.lstrip()
+            if probe in self._FENCE_PREFIXES:
+                return ""
+            if probe.startswith("```"):
+                nl = probe.find("\n")
+                if nl == -1:
+                    return ""  # fence line not complete yet
+                probe = probe[nl + 1:]
+            self._buf = probe
+            self._head_done = True
+
+        # keep back trailing whitespace and a last line that may be the closing fence
+        body = self._buf.rstrip()
+        cut = body.rfind("\n")
+        if body[cut + 1:].strip() in self._FENCE_PREFIXES:
+            hold = max(cut, 0)
+        else:
+            hold = len(body)
+        out, self._buf = self._buf[:hold], self._buf[hold:]
+        return out
+
+    def finish(self) -> str:
+        rest = self._buf if self._head_done else self._buf.lstrip()
+        self._buf = ""
+        if rest.strip() == "```" or not self._head_done and rest.startswith("```"):
+            return ""
+        return rest.rstrip()
+
+
+def strip_fences(text: str) -> str:
+    stripper = FenceStripper()
+    return (stripper.feed(text) + stripper.finish()).strip()
+
+
+async def _cover_letter_prompt(
     jobDescription: str = Form(...),
     jobTitle: str       = Form(...),
     companyName: str    = Form(...),
@@ -54,7 +101,7 @@ async def generate_cover_letter(
         if resume.content_type != "application/pdf":
             raise HTTPException(status_code=400, detail="Only PDF résumés are accepted")
         pdf_bytes = await resume.read()
-        resume_text = _pdf_to_text(pdf_bytes)
+        resume_text = await run_in_threadpool(_pdf_to_text, pdf_bytes)
 
 
     # Minimal template instructions – the FE’s big placeholders are *examples*
@@ -110,13 +157,68 @@ Job Title : {jobTitle}
     if wordCount:
         prompt += f"\n\nThe letter should be around {wordCount} words."
 
-    model = GenerativeModel(MODEL_NAME)
-    resp = model.generate_content(prompt)
+    return prompt
+
+
+@router.post("/generate", response_model=CoverLetterOut,
+             summary="Generate a tailored cover letter via Gemini")
+async def generate_cover_letter(
+    prompt: str = Depends(_cover_letter_prompt),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """
+    Uses Gemini to craft a cover‑letter.  
+    – If a PDF résumé is supplied, its plain text is injected as extra context.  
+    – The response is *plain text* returned as JSON → `{ \"letter\": \"…\" }`.
+    """
+    try:
+        text = await llm.generate(prompt)
+    except LLMError as exc:
+        raise HTTPException(status_code=502, detail=f"Gemini request failed: {exc}")
 
     # Gemini often returns exactly what we want; still strip accidental markdown fences
-    letter = re.sub(r"^```.*?\\n|\\n```$", "", resp.text, flags=re.S).strip()
+    letter = strip_fences(text)
 
     if not letter:
         raise HTTPException(status_code=500, detail="Failed to generate cover letter")
 
     return {"letter": letter}
+
+
+@router.post("/stream",
+             summary="Generate a cover letter via Gemini, streamed as Server-Sent Events")
+async def stream_cover_letter(
+    prompt: str = Depends(_cover_letter_prompt),
+    current_user: models.User = Depends(get_current_user),
+):
+    """
+    Same form as /generate. Emits `data: {"delta": "…"}` events as text arrives,
+    then `data: {"done": true, "letter": "…"}` (or `data: {"error": "…"}`).
+    """
+
+    async def events():
+        stripper = FenceStripper()
+        parts: list[str] = []
+        try:
+            async for piece in llm.stream(prompt):
+                delta = stripper.feed(piece)
+                if delta:
+                    parts.append(delta)
+                    yield f"data: {json.dumps({'delta': delta})}\n\n"
+        except LLMError as exc:
+            yield f"data: {json.dumps({'error': f'Gemini request failed: {exc}'})}\n\n"
+            return
+        tail = stripper.finish()
+        if tail:
+            parts.append(tail)
+            yield f"data: {json.dumps({'delta': tail})}\n\n"
+
+        letter = "".join(parts).strip()
+        if not letter:
+            yield f"data: {json.dumps({'error': 'Failed to generate cover letter'})}\n\n"
+            return
+        yield f"data: {json.dumps({'done': True, 'letter': letter})}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
@@ -6,45 +6,32 @@ structured scores + notes.
 
 from __future__ import annotations
 
+import asyncio
 import json
-import os
 import re
+from concurrent.futures import Future
 from pathlib import Path
 from typing import List
 
-import fitz  # PyMuPDF
-import google.generativeai as genai
 from fastapi import APIRouter, File, Form, HTTPException, UploadFile
-from google.generativeai import GenerativeModel
+from starlette.concurrency import run_in_threadpool
 
-from import_resume import _pdf_to_text
+from helpers.llm import LLMError, llm
+from helpers.llm_cache import llm_cache
+from helpers.pdf_locator import PdfPhraseIndex
+from helpers.pdf_text import pdf_to_text
 from schemas import CVAnalysisOut, Highlight
 
-# ─── Gemini setup ─────────────────────────────────────────────────────────
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-MODEL_NAME = os.getenv("GEMINI_MODEL", "gemini-2.5-flash-preview-05-20")
+# bump when the prompt in _ask_for_analysis changes, so cached analyses are not reused
+ANALYSIS_PROMPT_VERSION = "1"
+ANALYSIS_CONFIG = {"temperature": 0.2, "response_mime_type": "application/json"}
+MAX_PAGES = 20  # pages searched for highlight phrases
 
 # ─── Router ───────────────────────────────────────────────────────────────
 router = APIRouter(prefix="/ai/cv", tags=["cv‑analysis"])
 
 
-@router.post(
-    "/analyze",
-    response_model=CVAnalysisOut,
-    summary="Analyse résumé for Big‑Tech standards and return annotated PDF",
-)
-async def analyze_cv(
-    target_company: str = Form("Generic‑BigTech"),
-    role_title: str = Form("Software Engineer"),
-    cv: UploadFile = File(...),
-):
-    # ── basic validation ──────────────────────────────────────────────────
-    if cv.content_type != "application/pdf":
-        raise HTTPException(400, "Only PDF files supported")
-
-    pdf_bytes: bytes = await cv.read()
-    plain_text: str = _pdf_to_text(pdf_bytes)[:8500]  # keep prompt size sane
-
+async def _ask_for_analysis(plain_text: str, target_company: str, role_title: str) -> dict:
     # ── build prompt ──────────────────────────────────────────────────────
     prompt = f"""
 You are a top‑tier technical recruiter for {target_company}.
@@ -71,16 +58,18 @@ CV  :
 {plain_text}
 """
 
-    # ── Gemini call ───────────────────────────────────────────────────────
-    model = GenerativeModel(MODEL_NAME)
-    response = model.generate_content(
-        prompt,
-        generation_config={
-            "temperature": 0.2,
-            "response_mime_type": "application/json",
-        },
+    # ── Gemini call (cached per text / role / company) ───────────────────
+    cache_key = llm_cache.key_for(
+        llm.model_name, "cv_analysis", ANALYSIS_PROMPT_VERSION, plain_text,
+        {"company": target_company, "role": role_title, **ANALYSIS_CONFIG},
     )
-    raw = response.text
+    raw = await run_in_threadpool(llm_cache.get, cache_key)
+    cached = raw is not None
+    if not cached:
+        try:
+            raw = await llm.generate(prompt, generation_config=ANALYSIS_CONFIG)
+        except LLMError as exc:
+            raise HTTPException(502, f"Gemini request failed: {exc}")
 
     # ── robust JSON parse ─────────────────────────────────────────────────
     try:
@@ -93,42 +82,108 @@ CV  :
             parsed = json.loads(block.group(0))
         except json.JSONDecodeError as exc:
             raise HTTPException(500, f"Gemini JSON malformed: {exc}")
+    if not cached:
+        await run_in_threadpool(llm_cache.put, cache_key, raw)
+
+    return parsed
 
-    # ── annotate PDF ─────────────────────────────────────────────────────
-    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-    MAX_PAGES = min(doc.page_count, 20)
 
+def _annotate(index: PdfPhraseIndex, parsed: dict, out_path: str) -> List[Highlight]:
+    """
+    Highlights every note's phrase and saves the annotated copy (worker thread).
+    """
     highlights: List[Highlight] = []
+    buckets = (("positives", "positive"), ("negatives", "negative"))
+    found = index.locate_all(item["phrase"] for bucket, _ in buckets for item in parsed.get(bucket, []))
 
-    for bucket, polarity in (("positives", "positive"), ("negatives", "negative")):
+    for bucket, polarity in buckets:
         for item in parsed.get(bucket, []):
-            phrase = item["phrase"][:64]  # safety limit
+            phrase = item["phrase"][:PdfPhraseIndex.MAX_PHRASE]
             note = item["note"]
 
-            for page_num in range(MAX_PAGES):
-                page = doc[page_num]
-                for bbox in page.search_for(phrase):
-                    annot = page.add_highlight_annot(bbox)
-                    annot.set_colors(
-                        stroke=(0, 1, 0) if polarity == "positive" else (1, 0, 0)
-                    )
-                    annot.set_info(content=note)
-
-                    highlights.append(
-                        Highlight(
-                            page=page_num + 1,
-                            phrase=phrase,
-                            bbox=tuple(bbox),
-                            note=note,
-                            sentiment=polarity,
-                        )
+            for page_num, bbox in found[item["phrase"]]:
+                page = index.doc[page_num]
+                annot = page.add_highlight_annot(bbox)
+                annot.set_colors(
+                    stroke=(0, 1, 0) if polarity == "positive" else (1, 0, 0)
+                )
+                annot.set_info(content=note)
+
+                highlights.append(
+                    Highlight(
+                        page=page_num + 1,
+                        phrase=phrase,
+                        bbox=tuple(bbox),
+                        note=note,
+                        sentiment=polarity,
                     )
+                )
+
+    index.doc.save(out_path)
+    return highlights
+
+
+def _open_pdf(pdf_bytes: bytes, text_ready: "Future[str]") -> PdfPhraseIndex:
+    """
+    All PyMuPDF work of a request in one worker call (its global context is not
+    thread-safe): opens the PDF once, publishes the plain text through
+    `text_ready` so the Gemini call can start, then indexes the words.
+    """
+    def publish_text(doc) -> None:
+        try:
+            text_ready.set_result(pdf_to_text(pdf_bytes, doc))
+        except Exception as exc:
+            text_ready.set_exception(exc)
+            raise
 
-    # ── save annotated PDF ───────────────────────────────────────────────
+    try:
+        return PdfPhraseIndex(pdf_bytes, MAX_PAGES, on_open=publish_text)
+    except BaseException as exc:
+        if not text_ready.done():
+            text_ready.set_exception(exc)
+        raise
+
+
+def _close_index(task: "asyncio.Future[PdfPhraseIndex]") -> None:
+    if not task.cancelled() and task.exception() is None:
+        task.result().close()
+
+
+@router.post(
+    "/analyze",
+    response_model=CVAnalysisOut,
+    summary="Analyse résumé for Big‑Tech standards and return annotated PDF",
+)
+async def analyze_cv(
+    target_company: str = Form("Generic‑BigTech"),
+    role_title: str = Form("Software Engineer"),
+    cv: UploadFile = File(...),
+):
+    # ── basic validation ──────────────────────────────────────────────────
+    if cv.content_type != "application/pdf":
+        raise HTTPException(400, "Only PDF files supported")
+
+    pdf_bytes: bytes = await cv.read()
+
+    # ── one worker thread extracts the text, then indexes the words while Gemini answers
+    text_ready: "Future[str]" = Future()
+    index_task = asyncio.ensure_future(run_in_threadpool(_open_pdf, pdf_bytes, text_ready))
+    try:
+        plain_text: str = (await asyncio.wrap_future(text_ready))[:8500]  # keep prompt size sane
+        parsed = await _ask_for_analysis(plain_text, target_company, role_title)
+    except BaseException:
+        index_task.add_done_callback(_close_index)
+        raise
+    index = await index_task
+
+    # ── annotate + save PDF (only lookups left) ──────────────────────────
     Path("static").mkdir(exist_ok=True)
     out_name = cv.filename.replace(".pdf", "_annotated.pdf")
     out_path = f"static/{out_name}"
-    doc.save(out_path)
+    try:
+        highlights = await run_in_threadpool(_annotate, index, parsed, out_path)
+    finally:
+        index.close()
 
     # ── helper to grab the first note string safely ──────────────────────
     def first_note(bucket: str) -> str:
@@ -11,6 +11,7 @@ import schemas
 from latex_template import generate_latex_from_complete_resume
 from database import get_db
 from utils import get_current_user
+from helpers.resume_cache import invalidate_resume
 from fastapi import Response, UploadFile, File
 import tempfile
 from import_resume import _pdf_to_text, _ask_gemini_for_json, import_resume_from_json, replace_resume_from_json
@@ -34,6 +35,7 @@ def create_achievement(
     achievement = models.Achievement(**achievement_in.dict(), user_id=current_user.id)
     db.add(achievement)
     db.commit()
+    invalidate_resume(current_user.id)
     db.refresh(achievement)
     return achievement
 
@@ -77,6 +79,7 @@ def toggle_achievement_disable(
 
     achievement.is_disabled = not achievement.is_disabled
     db.commit()
+    invalidate_resume(current_user.id)
     db.refresh(achievement)
     return {"message": "Achievement updated", "is_disabled": achievement.is_disabled}
 
@@ -98,6 +101,7 @@ def update_achievement(
         setattr(achievement, key, value)
 
     db.commit()
+    invalidate_resume(current_user.id)
     db.refresh(achievement)
     return achievement
 
@@ -117,4 +121,5 @@ def delete_achievement(
 
     db.delete(achievement)
     db.commit()
+    invalidate_resume(current_user.id)
     return {"message": "Achievement deleted"}
@@ -11,6 +11,7 @@ import schemas
 from latex_template import generate_latex_from_complete_resume
 from database import get_db
 from utils import get_current_user
+from helpers.resume_cache import invalidate_resume
 from fastapi import Response, UploadFile, File
 import tempfile
 from import_resume import _pdf_to_text, _ask_gemini_for_json, import_resume_from_json, replace_resume_from_json
@@ -33,6 +34,7 @@ def create_contact(
     contact = models.Contact(**contact_in.dict(), user_id=current_user.id)
     db.add(contact)
     db.commit()
+    invalidate_resume(current_user.id)
     db.refresh(contact)
     return contact
 
@@ -79,6 +81,7 @@ def update_contact(
         setattr(contact, key, value)
 
     db.commit()
+    invalidate_resume(current_user.id)
     db.refresh(contact)
     return contact
 
@@ -98,4 +101,5 @@ def delete_contact(
 
     db.delete(contact)
     db.commit()
+    invalidate_resume(current_user.id)
     return {"message": "Contact deleted"}
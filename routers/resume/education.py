@@ -11,6 +11,7 @@ import schemas
 from latex_template import generate_latex_from_complete_resume
 from database import get_db
 from utils import get_current_user
+from helpers.resume_cache import invalidate_resume
 from fastapi import Response, UploadFile, File
 import tempfile
 from import_resume import _pdf_to_text, _ask_gemini_for_json, import_resume_from_json, replace_resume_from_json
@@ -33,6 +34,7 @@ def create_education(
     education = models.Education(**education_in.dict(), user_id=current_user.id)
     db.add(education)
     db.commit()
+    invalidate_resume(current_user.id)
     db.refresh(education)
     return education
 
@@ -76,6 +78,7 @@ def toggle_education_disable(
 
     education.is_disabled = not education.is_disabled
     db.commit()
+    invalidate_resume(current_user.id)
     db.refresh(education)
     return {"message": "Education updated", "is_disabled": education.is_disabled}
 
@@ -97,6 +100,7 @@ def update_education(
         setattr(education, key, value)
 
     db.commit()
+    invalidate_resume(current_user.id)
     db.refresh(education)
     return education
 
@@ -116,4 +120,5 @@ def delete_education(
 
     db.delete(education)
     db.commit()
+    invalidate_resume(current_user.id)
     return {"message": "Education deleted"}
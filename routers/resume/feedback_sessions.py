@@ -1,9 +1,9 @@
 
-from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Query, Path
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, Query, Path
 from sqlalchemy.orm import Session
 from starlette.responses import RedirectResponse, JSONResponse
 from datetime import datetime
-from database import get_db
+from database import get_async_db, get_db
 from config import settings
 from models import User
 from models import FeedbackSession, FeedbackReview, FeedbackComment
@@ -13,16 +13,33 @@ from schemas import (
 )
 
 from fastapi import Response, Request
-from starlette.responses import StreamingResponse
-import requests
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from starlette.formparsers import MultiPartException, MultiPartParser
+from starlette.responses import FileResponse
 
 from utils import get_current_user
-from gcs import upload_fileobj, generate_signed_url, make_object_name
-import os, uuid, json, shutil
+from gcs import (
+    upload_fileobj, cached_signed_url, delete_object, download_to_filename, make_object_name,
+    is_local_backend, local_object_path,
+)
+from helpers.http_cache import EtagFileResponse, etag_matches, not_modified
+from helpers.pdf_edge_cache import pdf_edge_cache
+from helpers.pdf_proxy import pdf_proxy
+import hashlib, os, uuid, json, shutil
+from functools import partial
 
 router = APIRouter(prefix="/feedback-sessions", tags=["feedback-sessions"])
 
 HEX10 = r"^[a-f0-9]{10}$"
+# the share token is in the URL, so shared caches must not keep the PDF
+PDF_CACHE_CONTROL = "private, no-cache"
+# multipart boundaries and part headers on top of the PDF itself
+UPLOAD_FORM_OVERHEAD = 64 * 1024
+UPLOAD_OPENAPI = {"requestBody": {"required": True, "content": {"multipart/form-data": {"schema": {
+    "type": "object", "required": ["file"], "properties": {"file": {"type": "string", "format": "binary"}},
+}}}}}
 
 @router.post("", response_model=FeedbackSessionRead)
 def create_session(
@@ -89,29 +106,120 @@ def get_session_owner(
         is_open=sess.is_open, pdf_url=pdf_endpoint
     )
 
-@router.post("/{slug}/upload")
-def upload_pdf(
-    slug: str,
-    file: UploadFile = File(...),
-    db: Session = Depends(get_db),
-    current: User = Depends(get_current_user),
-):
+class _UploadTooLarge(MultiPartException):
+    pass
+
+
+class _PdfUploadParser(MultiPartParser):
+    """
+    MultiPartParser that hashes and counts the "file" part as its bytes arrive,
+    so the spooled upload never has to be read back for its sha256 or size.
+    """
+
+    def __init__(self, headers, stream, max_bytes: int):
+        super().__init__(headers, stream, max_files=1, max_fields=10)
+        self.max_bytes = max_bytes
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        super().on_part_data(data, start, end)
+        part = self._current_part
+        if part.file is not None and part.field_name == "file":
+            self.size += end - start
+            if self.size > self.max_bytes:
+                raise _UploadTooLarge("upload too large")
+            self.sha256.update(data[start:end])
+
+
+async def _receive_pdf(request: Request, max_bytes: int) -> tuple[UploadFile, int, str]:
+    """
+    Parses the multipart body straight off the socket, so an oversized upload is
+    refused by Content-Length or cut off mid-stream instead of being spooled whole.
+    Returns the spooled file with its size and sha256, computed on the way in.
+    """
+    too_large = HTTPException(413, f"PDF is larger than {max_bytes // (1024 * 1024)} MB")
+    limit = max_bytes + UPLOAD_FORM_OVERHEAD
+    length = request.headers.get("content-length", "")
+    if length.isdigit() and int(length) > limit:
+        raise too_large
+
+    async def capped():
+        received = 0
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > limit:
+                raise _UploadTooLarge("upload too large")
+            yield chunk
+
+    parser = _PdfUploadParser(request.headers, capped(), max_bytes)
+    try:
+        form = await parser.parse()
+    except _UploadTooLarge:
+        raise too_large
+    except MultiPartException as exc:
+        raise HTTPException(400, exc.message)
+    file = form.get("file")
+    if file is None or isinstance(file, str):
+        await form.close()
+        raise HTTPException(422, "file is required")
+    return file, parser.size, parser.sha256.hexdigest()
+
+
+def _owned_session(slug: str, db: Session, current: User) -> FeedbackSession:
     sess = db.query(FeedbackSession).filter(FeedbackSession.slug == slug).first()
     if not sess: raise HTTPException(404, "Session not found")
     if sess.owner_id != current.id: raise HTTPException(403, "Not your session")
-    if not file.filename.lower().endswith(".pdf"): raise HTTPException(400, "Only PDF allowed")
+    return sess
+
+
+def _store_pdf(sess: FeedbackSession, file: UploadFile, size: int, digest: str, db: Session) -> dict:
+    slug = sess.slug
+    if not (file.filename or "").lower().endswith(".pdf"): raise HTTPException(400, "Only PDF allowed")
 
-    object_name = make_object_name(sess.id)  # "feedback/<id>/cv.pdf"
+    object_name = make_object_name(sess.id, digest)  # "feedback/<id>/<sha256[:16]>.pdf"
+    result = {"ok": True, "pdf_url": f"/resume/feedback-sessions/{slug}/pdf", "size": size, "sha256": digest}
 
-    # Upload stream directly to GCS
-    upload_fileobj(file.file, settings.GCS_BUCKET, object_name, content_type="application/pdf")
+    if object_name == sess.pdf_object:
+        # identical re-upload: already stored and cached
+        return {**result, "deduplicated": True}
 
+    # Upload stream to GCS (resumable, chunked for large files)
+    upload_fileobj(file.file, settings.GCS_BUCKET, object_name, content_type="application/pdf", size=size)
+    if not is_local_backend():
+        pdf_edge_cache.put_file(object_name, file.file, digest=digest)
+
+    previous = sess.pdf_object
     sess.pdf_object = object_name
     db.commit(); db.refresh(sess)
 
+    if previous:
+        # best effort: the session no longer points at it
+        pdf_edge_cache.invalidate(previous)
+        try:
+            delete_object(settings.GCS_BUCKET, previous)
+        except Exception:
+            pass
+
     # (Optional) include a ready-to-use signed URL, or just return our proxy endpoint.
     # Returning proxy keeps token logic on server side:
-    return {"ok": True, "pdf_url": f"/resume/feedback-sessions/{slug}/pdf"}
+    return {**result, "deduplicated": False}
+
+
+@router.post("/{slug}/upload", openapi_extra=UPLOAD_OPENAPI)
+async def upload_pdf(
+    slug: str,
+    request: Request,
+    db: Session = Depends(get_db),
+    current: User = Depends(get_current_user),
+):
+    # ownership first: a stranger's upload is refused before its body is read
+    sess = await run_in_threadpool(_owned_session, slug, db, current)
+    file, size, digest = await _receive_pdf(request, settings.FEEDBACK_PDF_MAX_BYTES)
+    try:
+        return await run_in_threadpool(_store_pdf, sess, file, size, digest, db)
+    finally:
+        await file.close()
 
 
 
@@ -139,44 +247,84 @@ def get_session_public(
 
 
 
+class _PinnedPdfResponse(EtagFileResponse):
+    """
+    Releases the edge-cache pin once the file has been sent (or sending failed),
+    so eviction cannot delete it between lookup and the open inside FileResponse.
+    """
+
+    def __init__(self, object_name: str, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.object_name = object_name
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            pdf_edge_cache.release(self.object_name)
+
+
+def _edge_cached_pdf(request: Request, object_name: str, path: str, etag: str,
+                     stat_result: os.stat_result) -> Response:
+    if etag_matches(request, etag):
+        pdf_edge_cache.release(object_name)
+        return not_modified(etag, PDF_CACHE_CONTROL)
+    # FileResponse answers Range / If-Range against this ETag; the stat from lookup is reused
+    return _PinnedPdfResponse(object_name, path, media_type="application/pdf", stat_result=stat_result,
+                              headers={"ETag": etag, "Cache-Control": PDF_CACHE_CONTROL})
+
+
 @router.get("/{slug}/pdf")
-def get_pdf_file(
+async def get_pdf_file(
     request: Request,
     slug: str = Path(..., pattern=HEX10),
     t: str = Query(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    sess = db.query(FeedbackSession).filter(FeedbackSession.slug == slug).first()
+    sess = (await db.execute(
+        select(FeedbackSession).where(FeedbackSession.slug == slug)
+    )).scalar_one_or_none()
     if not sess or not sess.is_open or t != sess.token:
         raise HTTPException(404, "Not available")
     if not sess.pdf_object:
         raise HTTPException(404, "PDF not uploaded")
 
-    signed = generate_signed_url(settings.GCS_BUCKET, sess.pdf_object, expires_minutes=20)
-
-    # Forward Range header so pdf.js can do partial reads
-    headers = {}
-    range_hdr = request.headers.get("range")
-    if range_hdr:
-        headers["Range"] = range_hdr
-
-    # Stream from GCS to client
-    upstream = requests.get(signed, headers=headers, stream=True)
-    if upstream.status_code not in (200, 206):
-        raise HTTPException(upstream.status_code, "Failed to fetch PDF")
-
-    # Pass through important headers for pdf.js
-    passthrough = {}
-    for h in ["Content-Type", "Content-Length", "Accept-Ranges", "Content-Range", "ETag", "Last-Modified", "Cache-Control"]:
-        if h in upstream.headers:
-            passthrough[h] = upstream.headers[h]
-
-    return StreamingResponse(
-        upstream.iter_content(chunk_size=1024*256),
-        status_code=upstream.status_code,
-        headers=passthrough,
-        media_type=upstream.headers.get("Content-Type", "application/pdf"),
-    )
+    if settings.PDF_DELIVERY_MODE == "redirect" and not is_local_backend():
+        # token checked: let the client fetch the bytes from GCS directly
+        try:
+            target = await run_in_threadpool(cached_signed_url, settings.GCS_BUCKET, sess.pdf_object, 20)
+        except Exception:
+            # e.g. credentials that cannot sign URLs: fall back to serving it ourselves
+            target = None
+        if target:
+            return RedirectResponse(target, status_code=302,
+                                    headers={"Cache-Control": PDF_CACHE_CONTROL})
+
+    if is_local_backend():
+        # filesystem stand-in (both delivery modes): nothing to proxy, FileResponse handles Range itself
+        return FileResponse(local_object_path(settings.GCS_BUCKET, sess.pdf_object),
+                            media_type="application/pdf", headers={"Cache-Control": PDF_CACHE_CONTROL})
+
+    cached = await run_in_threadpool(pdf_edge_cache.lookup, sess.pdf_object)
+    if not cached and pdf_edge_cache.enabled:
+        # one GCS download fills the cache, then this viewer is served from it like the next ones
+        try:
+            await run_in_threadpool(
+                pdf_edge_cache.fill, sess.pdf_object,
+                partial(download_to_filename, settings.GCS_BUCKET, sess.pdf_object),
+            )
+        except Exception:
+            pass  # proxy it instead
+        else:
+            cached = await run_in_threadpool(pdf_edge_cache.lookup, sess.pdf_object)
+    if cached:
+        return _edge_cached_pdf(request, sess.pdf_object, *cached)
+
+    signed = await run_in_threadpool(cached_signed_url, settings.GCS_BUCKET, sess.pdf_object, 20)
+
+    # Stream from GCS to client (Range is forwarded so pdf.js can do partial reads)
+    # GCS sends "public, max-age=0"; the share token in the URL needs PDF_CACHE_CONTROL here too
+    return await pdf_proxy.stream(signed, request, cache_control=PDF_CACHE_CONTROL)
 
 @router.post("/{slug}/upsert-review", response_model=FeedbackReviewOut)
 def upsert_review(
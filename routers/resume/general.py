@@ -11,6 +11,7 @@ import schemas
 from latex_template import generate_latex_from_complete_resume
 from database import get_db
 from utils import get_current_user
+from helpers.resume_cache import invalidate_resume
 from fastapi import Response, UploadFile, File
 import tempfile
 from import_resume import _pdf_to_text, _ask_gemini_for_json, import_resume_from_json, replace_resume_from_json
@@ -36,6 +37,7 @@ def create_general(
         for key, value in general_in.dict().items():
             setattr(existing, key, value)
         db.commit()
+        invalidate_resume(current_user.id)
         db.refresh(existing)
         return existing
 
@@ -43,6 +45,7 @@ def create_general(
     general = models.General(**general_in.dict(), user_id=current_user.id)
     db.add(general)
     db.commit()
+    invalidate_resume(current_user.id)
     db.refresh(general)
     return general
 
@@ -63,6 +66,7 @@ def get_general(
             user_id = current_user.id)
         db.add(general)
         db.commit()
+        invalidate_resume(current_user.id)
         db.refresh(general)
     return general
 
@@ -84,5 +88,6 @@ def update_general(
             setattr(general, key, value)
 
     db.commit()
+    invalidate_resume(current_user.id)
     db.refresh(general)
     return general
@@ -7,6 +7,7 @@ from utils import get_current_user
 from fastapi import  UploadFile, File
 from import_resume import _pdf_to_text, _ask_gemini_for_json, import_resume_from_json, replace_resume_from_json
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 from helpers.resume import get_complete_resume
 
 from pydantic import BaseModel
@@ -25,8 +26,8 @@ async def import_resume(
         raise HTTPException(status_code=400, detail="Only PDF files are supported")
     pdf_bytes = await file.read()
     try:
-        plain = _pdf_to_text(pdf_bytes)
-        parsed = _ask_gemini_for_json(plain)
+        plain = await run_in_threadpool(_pdf_to_text, pdf_bytes)
+        parsed = await _ask_gemini_for_json(plain)
     except Exception as exc:
         raise HTTPException(status_code=500,
                             detail=f"Gemini parsing failed: {exc!s}")
@@ -46,8 +47,8 @@ async def import_resume_preview(
 
     pdf_bytes = await file.read()
     try:
-        plain = _pdf_to_text(pdf_bytes)
-        parsed = _ask_gemini_for_json(plain)  # <- Gemini/ChatGPT call
+        plain = await run_in_threadpool(_pdf_to_text, pdf_bytes)
+        parsed = await _ask_gemini_for_json(plain)  # <- Gemini/ChatGPT call
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Gemini parsing failed: {exc}")
 
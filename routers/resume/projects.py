@@ -11,6 +11,7 @@ import schemas
 from latex_template import generate_latex_from_complete_resume
 from database import get_db
 from utils import get_current_user
+from helpers.resume_cache import invalidate_resume
 from fastapi import Response, UploadFile, File
 import tempfile
 from import_resume import _pdf_to_text, _ask_gemini_for_json, import_resume_from_json, replace_resume_from_json
@@ -34,6 +35,7 @@ def create_project(
     project = models.Project(**project_in.dict(), user_id=current_user.id)
     db.add(project)
     db.commit()
+    invalidate_resume(current_user.id)
     db.refresh(project)
     return project
 
@@ -76,6 +78,7 @@ def toggle_project_disable(
 
     project.is_disabled = not project.is_disabled
     db.commit()
+    invalidate_resume(current_user.id)
     db.refresh(project)
     return {"message": "Project updated", "is_disabled": project.is_disabled}
 
@@ -97,6 +100,7 @@ def update_project(
         setattr(project, key, value)
 
     db.commit()
+    invalidate_resume(current_user.id)
     db.refresh(project)
     return project
 
@@ -116,4 +120,5 @@ def delete_project(
 
     db.delete(project)
     db.commit()
+    invalidate_resume(current_user.id)
     return {"message": "Project deleted"}
@@ -1,25 +1,29 @@
 # routers/resume/render.py
 from __future__ import annotations
 
+import asyncio
 import json
-import os
-import subprocess
-import tempfile
 import re
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Body, Depends, HTTPException, Response
+from fastapi import APIRouter, Body, Depends, HTTPException, Request, Response
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 import models
 import schemas
+from config import settings
 from database import get_db
+from helpers.http_cache import etag_matches, not_modified, strong_etag
+from helpers.latex_engine import LatexCompileError, latex_engine
+from helpers.render_cache import render_cache
+from helpers.render_jobs import DONE, FAILED, FINISHED, render_jobs
 from helpers.resume import get_complete_resume, get_complete_resume_with_enabled_entities
 from helpers.sort_resume import sort_resume_inplace
 from latex_template import generate_latex_from_complete_resume
-from utils import get_current_user
+from utils import forget_principal, get_current_user, get_current_user_async
 
 router = APIRouter(prefix="", tags=["render"])
 
@@ -50,30 +54,26 @@ def _resolve_saved_order(user: models.User) -> List[str]:
         return DEFAULT_ORDER
 
 
-def _compile_tex_to_pdf_bytes(latex_src: str) -> bytes:
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tex_path = os.path.join(tmpdir, "resume.tex")
-        with open(tex_path, "w", encoding="utf-8") as f:
-            f.write(latex_src)
+async def _compile_tex_to_pdf_bytes_async(latex_src: str) -> bytes:
+    try:
+        return await latex_engine.compile_async(latex_src)
+    except LatexCompileError as exc:
+        raise HTTPException(status_code=500, detail=str(exc))
 
-        # Run pdflatex twice for stable refs
-        for _ in range(2):
-            proc = subprocess.run(
-                ["pdflatex", "-interaction=nonstopmode", "resume.tex"],
-                cwd=tmpdir,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-            )
-            if proc.returncode != 0:
-                log = proc.stdout.decode("utf-8", errors="ignore") + "\n" + proc.stderr.decode("utf-8", errors="ignore")
-                raise HTTPException(status_code=500, detail=f"LaTeX compilation failed:\n{log}")
 
-        pdf_path = os.path.join(tmpdir, "resume.pdf")
-        if not os.path.exists(pdf_path):
-            raise HTTPException(status_code=500, detail="PDF not found after compilation.")
+async def _render_pdf_cached(latex_src: str) -> tuple[bytes, bool]:
+    """
+    Returns (pdf_bytes, cache_hit). Identical LaTeX sources are compiled once.
+    """
+    key = render_cache.key_for(latex_src)
+    # the disk tier reads, writes and evicts files: keep that off the event loop
+    cached = await asyncio.to_thread(render_cache.get, key)
+    if cached is not None:
+        return cached, True
 
-        with open(pdf_path, "rb") as pdf_file:
-            return pdf_file.read()
+    pdf_bytes = await _compile_tex_to_pdf_bytes_async(latex_src)
+    await asyncio.to_thread(render_cache.put, key, pdf_bytes)
+    return pdf_bytes, False
 
 
 def _build_resume_from_body(body: Dict[str, Any]) -> schemas.CompleteResume:
@@ -96,9 +96,8 @@ def _build_resume_from_body(body: Dict[str, Any]) -> schemas.CompleteResume:
 # ------------------------------ order endpoints ------------------------------
 
 @router.get("/sections-order", response_model=schemas.SectionsOrderRead)
-def get_sections_order(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
+async def get_sections_order(
+    current_user: models.User = Depends(get_current_user_async),
 ):
     if not current_user.sections_order:
         return {"sections": ALLOWED_ORDER}
@@ -118,19 +117,18 @@ def put_sections_order(
     clean = _normalize_sections(payload.sections)
     current_user.sections_order = json.dumps(clean)
     db.add(current_user); db.commit()
+    forget_principal(current_user.id)
     return {"sections": clean}
 
 
 
 # ------------------------------ me (PDF) ------------------------------
 
-@router.post("/latex/me")
-@router.get("/latex/me")  # alias
-def render_my_latex_cv(
-    body: Optional[Dict[str, Any]] = Body(default=None),
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_user),
-):
+def _latex_for_me(
+    body: Optional[Dict[str, Any]],
+    db: Session,
+    current_user: models.User,
+) -> str:
     saved_order = _resolve_saved_order(current_user)
     sections_order = None
 
@@ -151,12 +149,118 @@ def render_my_latex_cv(
 
     sort_resume_inplace(resume_data)
 
-    latex_src = generate_latex_from_complete_resume(resume_data, sections_order)
-    pdf_bytes = _compile_tex_to_pdf_bytes(latex_src)
+    return generate_latex_from_complete_resume(resume_data, sections_order)
+
+
+@router.post("/latex/me")
+@router.get("/latex/me")  # alias
+async def render_my_latex_cv(
+    request: Request,
+    body: Optional[Dict[str, Any]] = Body(default=None),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    latex_src = await run_in_threadpool(_latex_for_me, body, db, current_user)
+
+    # the PDF is a pure function of its LaTeX source, so the source hash is its version
+    etag = strong_etag(render_cache.key_for(latex_src))
+    cache_control = "private, no-cache"
+    # only the GET alias revalidates (etag_matches ignores POST); a preview always gets the PDF
+    if etag_matches(request, etag):
+        return not_modified(etag, cache_control)
+
+    pdf_bytes, hit = await _render_pdf_cached(latex_src)
 
     return StreamingResponse(
         iter([pdf_bytes]),
         media_type="application/pdf",
+        headers={
+            "Content-Disposition": f"inline; filename=resume_{current_user.id}.pdf",
+            "X-Render-Cache": "HIT" if hit else "MISS",
+            "ETag": etag,
+            "Cache-Control": cache_control,
+        },
+    )
+
+
+# ------------------------------ me (background jobs) ------------------------------
+
+def _job_for_owner(job_id: str, current_user: models.User) -> Dict[str, Any]:
+    job = render_jobs.get(job_id)
+    if not job or job["owner_id"] != current_user.id:
+        raise HTTPException(status_code=404, detail="Render job not found")
+    return job
+
+
+@router.post("/jobs", status_code=202)
+def submit_render_job(
+    body: Optional[Dict[str, Any]] = Body(default=None),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """
+    Ставит рендер PDF в очередь. Принимает те же поля что и /latex/me.
+    """
+    latex_src = _latex_for_me(body, db, current_user)
+    job = render_jobs.submit(current_user.id, latex_src)
+    return {"job_id": job["id"], "status": job["status"]}
+
+
+@router.get("/jobs/{job_id}")
+def get_render_job(
+    job_id: str,
+    current_user: models.User = Depends(get_current_user),
+):
+    return _job_for_owner(job_id, current_user)
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_render_job(
+    job_id: str,
+    current_user: models.User = Depends(get_current_user),
+):
+    """
+    Server-Sent Events: one event per status change, closes once the job is finished.
+    Store reads go through the threadpool (the redis/filesystem stores block).
+    """
+    job = await run_in_threadpool(_job_for_owner, job_id, current_user)
+
+    async def events():
+        last = None
+        current = job
+        while True:
+            if current is None:
+                yield f"data: {json.dumps({'id': job_id, 'status': 'expired'})}\n\n"
+                return
+            if current["status"] != last:
+                last = current["status"]
+                yield f"data: {json.dumps(current)}\n\n"
+            if current["status"] in FINISHED:
+                return
+            await asyncio.sleep(0.5)
+            current = await run_in_threadpool(render_jobs.get, job_id)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
+
+
+@router.get("/jobs/{job_id}/pdf")
+def get_render_job_pdf(
+    job_id: str,
+    current_user: models.User = Depends(get_current_user),
+):
+    job = _job_for_owner(job_id, current_user)
+    if job["status"] == FAILED:
+        raise HTTPException(status_code=500, detail=job["error"])
+    if job["status"] != DONE:
+        raise HTTPException(status_code=409, detail=f"Render job is {job['status']}")
+
+    pdf_bytes = render_jobs.get_pdf(job_id)
+    if pdf_bytes is None:
+        raise HTTPException(status_code=404, detail="Render result expired")
+    return Response(
+        content=pdf_bytes,
+        media_type="application/pdf",
         headers={"Content-Disposition": f"inline; filename=resume_{current_user.id}.pdf"},
     )
 
@@ -192,16 +296,21 @@ def render_my_latex_source_me(
 # ------------------------------ public (PDF) ------------------------------
 
 @router.post("/latex/public")
-def render_public_latex_cv(
+async def render_public_latex_cv(
     resume_data: schemas.CompleteResume,
 ):
     # Публичная версия — фиксированный порядок.
     latex_src = generate_latex_from_complete_resume(resume_data, DEFAULT_ORDER)
-    pdf_bytes = _compile_tex_to_pdf_bytes(latex_src)
+
+    # POST only: If-None-Match is not honoured here (RFC 9110 §13.1.2)
+    pdf_bytes, hit = await _render_pdf_cached(latex_src)
     return StreamingResponse(
         iter([pdf_bytes]),
         media_type="application/pdf",
-        headers={"Content-Disposition": "inline; filename=resume_public.pdf"},
+        headers={
+            "Content-Disposition": "inline; filename=resume_public.pdf",
+            "X-Render-Cache": "HIT" if hit else "MISS",
+        },
     )
 
 
@@ -213,3 +322,27 @@ def render_public_latex_source(
 ):
     latex_src = generate_latex_from_complete_resume(resume_data, DEFAULT_ORDER)
     return Response(content=latex_src, media_type="text/plain")
+
+
+# ------------------------------ operator stats ------------------------------
+
+def _require_operator(current_user: models.User = Depends(get_current_user)) -> models.User:
+    # operator-only internals: everyone else gets the same 404 as an unknown route
+    if current_user.username not in settings.OPERATOR_USERNAMES:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return current_user
+
+
+@router.get("/cache/stats")
+def get_render_cache_stats(
+    current_user: models.User = Depends(_require_operator),
+):
+    return render_cache.stats()
+
+
+@router.get("/engine/stats")
+def get_render_engine_stats(
+    current_user: models.User = Depends(_require_operator),
+):
+    # async_waiting is the number of renders queued behind the LaTeX semaphore
+    return latex_engine.stats()
@@ -11,6 +11,7 @@ import schemas
 from latex_template import generate_latex_from_complete_resume
 from database import get_db
 from utils import get_current_user
+from helpers.resume_cache import invalidate_resume
 from fastapi import Response, UploadFile, File
 import tempfile
 from import_resume import _pdf_to_text, _ask_gemini_for_json, import_resume_from_json, replace_resume_from_json
@@ -34,6 +35,7 @@ def create_skill(
     skill = models.Skill(**skill_in.dict(), user_id=current_user.id)
     db.add(skill)
     db.commit()
+    invalidate_resume(current_user.id)
     db.refresh(skill)
     return skill
 
@@ -77,6 +79,7 @@ def toggle_skill_disable(
 
     skill.is_disabled = not skill.is_disabled
     db.commit()
+    invalidate_resume(current_user.id)
     db.refresh(skill)
     return {"message": "Skill updated", "is_disabled": skill.is_disabled}
 
@@ -99,6 +102,7 @@ def update_skill(
         setattr(skill, key, value)
 
     db.commit()
+    invalidate_resume(current_user.id)
     db.refresh(skill)
     return skill
 
@@ -117,4 +121,5 @@ def delete_skill(
 
     db.delete(skill)
     db.commit()
+    invalidate_resume(current_user.id)
     return {"message": "Skill deleted"} 
\ No newline at end of file
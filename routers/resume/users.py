@@ -3,21 +3,24 @@ import subprocess
 
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi import Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
 import tempfile
 import models
 import schemas
 from latex_template import generate_latex_from_complete_resume
-from database import get_db
-from utils import get_current_user
+from database import get_async_db, get_db
+from utils import forget_principal, get_current_user, get_current_user_id
 from fastapi import Response, UploadFile, File
 import tempfile
 from import_resume import _pdf_to_text, _ask_gemini_for_json, import_resume_from_json, replace_resume_from_json
 from fastapi.responses import JSONResponse, StreamingResponse
-from fastapi import Body
+from fastapi import Body, Request
 from typing import Any
-from helpers.resume import get_complete_resume
+from helpers.http_cache import etag_matches, not_modified, resume_version, strong_etag
+from helpers.resume import get_complete_resume_async, get_public_resume_async
 
 from pydantic import BaseModel
 
@@ -42,24 +45,41 @@ def update_username(
 
     current_user.username = username_update.username
     db.commit()
+    forget_principal(current_user.id)
     db.refresh(current_user)
     return current_user
 
 
 @router.get("/me/full", response_model=schemas.CompleteResume)
-def get_my_full_info(
-        db: Session = Depends(get_db),
-        current_user: models.User = Depends(get_current_user)
+async def get_my_full_info(
+        db: AsyncSession = Depends(get_async_db),
+        user_id: int = Depends(get_current_user_id)
 ):
-    return get_complete_resume(current_user.id, db)
+    return await get_complete_resume_async(user_id, db)
 
 
 @router.get("/{username}/full", response_model=schemas.CompleteResume)
-def get_full_info_by_username(
+async def get_full_info_by_username(
         username: str,
-        db: Session = Depends(get_db)
+        request: Request,
+        response: Response,
+        db: AsyncSession = Depends(get_async_db)
 ):
-    user = db.query(models.User).filter(models.User.username == username).first()
-    if not user:
+    # hot public path: the resume comes from the snapshot cache. The username is
+    # resolved on every request (one indexed lookup): a cached mapping could not be
+    # invalidated in other workers once the name is changed and taken by someone else.
+    user_id = (await db.execute(
+        select(models.User.id).where(models.User.username == username)
+    )).scalar()
+    if user_id is None:
         raise HTTPException(status_code=404, detail="User not found")
-    return get_complete_resume(user.id, db)
+    resume = await get_public_resume_async(user_id, db)
+
+    # browsers and the CDN revalidate with If-None-Match instead of re-downloading
+    etag = strong_etag(resume_version(resume))
+    cache_control = "public, no-cache"
+    if etag_matches(request, etag):
+        return not_modified(etag, cache_control)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    return resume
@@ -3,14 +3,17 @@ import subprocess
 
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi import Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List
 import tempfile
 import models
 import schemas
 from latex_template import generate_latex_from_complete_resume
-from database import get_db
-from utils import get_current_user
+from database import get_async_db, get_db
+from utils import get_current_user, get_current_user_id
+from helpers.resume_cache import invalidate_resume
 from fastapi import Response, UploadFile, File
 import tempfile
 from import_resume import _pdf_to_text, _ask_gemini_for_json, import_resume_from_json, replace_resume_from_json
@@ -34,17 +37,20 @@ def create_work_experience(
     work_exp = models.WorkExperience(**work_exp_in.dict(), user_id=current_user.id)
     db.add(work_exp)
     db.commit()
+    invalidate_resume(current_user.id)
     db.refresh(work_exp)
     return work_exp
 
 
 @router.get("/", response_model=List[schemas.WorkExperienceRead])
-def get_work_experiences(
-        db: Session = Depends(get_db),
-        current_user: models.User = Depends(get_current_user)
+async def get_work_experiences(
+        db: AsyncSession = Depends(get_async_db),
+        user_id: int = Depends(get_current_user_id)
 ):
-    work_exps = db.query(models.WorkExperience).filter(models.WorkExperience.user_id == current_user.id).all()
-    return work_exps
+    result = await db.execute(
+        select(models.WorkExperience).filter(models.WorkExperience.user_id == user_id)
+    )
+    return result.scalars().all()
 
 
 @router.get("/{work_exp_id}", response_model=schemas.WorkExperienceRead)
@@ -80,6 +86,7 @@ def update_work_experience(
         setattr(work_exp, key, value)
 
     db.commit()
+    invalidate_resume(current_user.id)
     db.refresh(work_exp)
     return work_exp
 
@@ -98,6 +105,7 @@ def toggle_we_disable(
 
     work_exp.is_disabled = not work_exp.is_disabled
     db.commit()
+    invalidate_resume(current_user.id)
     db.refresh(work_exp)
     return {"message": "Work experience updated", "is_disabled": work_exp.is_disabled}
 
@@ -117,5 +125,6 @@ def delete_work_experience(
 
     db.delete(work_exp)
     db.commit()
+    invalidate_resume(current_user.id)
     return {"message": "Work experience deleted"}
 
@@ -1,7 +1,7 @@
 from pathlib import Path
 from uuid import uuid4
 
-from utils import get_current_user
+from utils import forget_principal, get_current_user
 
 from fastapi import UploadFile, File, APIRouter
 from fastapi import Depends, HTTPException
@@ -24,6 +24,7 @@ def update_user_profile(
     for attr, value in user_in.dict(exclude_unset=True).items():
         setattr(current_user, attr, value)
     db.commit()
+    forget_principal(current_user.id)
     db.refresh(current_user)
     return current_user
 @router.get("/me", response_model=schemas.UserRead)
@@ -52,6 +53,7 @@ def upload_user_photo(
     # Обновить URL в базе
     current_user.photo_url = f"/static/uploads/{filename}"
     db.commit()
+    forget_principal(current_user.id)
     db.refresh(current_user)
 
     return current_user
@@ -72,6 +74,7 @@ def update_username(
 
     current_user.username = username_in.username
     db.commit()
+    forget_principal(current_user.id)
     db.refresh(current_user)
     return current_user
 
@@ -0,0 +1,119 @@
+"""
+Concurrent-write benchmark against the CRUD routers: many users POST work
+experience entries at once through the ASGI app (sync routes run on the
+threadpool, as under uvicorn).
+
+Compares, each on a fresh SQLite file:
+
+  legacy   the engine as it was before DATABASE_URL/pooling/pragmas (default
+           rollback journal, no busy timeout)
+  tuned    database.py as configured (WAL, synchronous=NORMAL, busy_timeout, mmap)
+
+    SECRET_KEY=x python scripts/bench_db_writes.py [--writers 32] [--requests 40]
+
+Pass --url to run the "tuned" mode against a server database instead.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+
+async def _run_writers(app, tokens, per_writer: int) -> dict:
+    import httpx
+
+    latencies, errors = [], 0
+
+    async def writer(client: httpx.AsyncClient, token: str):
+        nonlocal errors
+        headers = {"Authorization": f"Bearer {token}"}
+        for i in range(per_writer):
+            started = time.perf_counter()
+            try:
+                r = await client.post("/resume/work-experience/", headers=headers,
+                                      json={"title": f"Job {i}", "company": "ACME", "description": "x" * 400})
+                ok = r.status_code == 200
+            except Exception:
+                ok = False
+            latencies.append((time.perf_counter() - started) * 1000)
+            errors += not ok
+
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(writer(client, t) for t in tokens))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput": len(latencies) / elapsed,
+        "p50": statistics.median(latencies),
+        "p99": latencies[max(0, int(len(latencies) * 0.99) - 1)],
+    }
+
+
+def child(mode: str, writers: int, per_writer: int) -> None:
+    import database
+
+    if mode == "legacy":
+        # what database.py did before: no connect-time pragmas
+        from sqlalchemy import event
+        event.remove(database.engine, "connect", database._sqlite_pragmas)
+
+    import main  # noqa: F401  (creates the tables)
+    import models
+    from utils import create_access_token
+
+    db = database.SessionLocal()
+    users = [models.User(email=f"w{i}@example.com", username=f"w{i}") for i in range(writers)]
+    db.add_all(users)
+    db.commit()
+    tokens = [create_access_token(data={"sub": str(u.id)}) for u in users]
+    db.close()
+
+    print(json.dumps(asyncio.run(_run_writers(main.app, tokens, per_writer))))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--writers", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=40, help="writes per writer")
+    parser.add_argument("--url", help="database URL for the tuned run (default: temp SQLite file)")
+    parser.add_argument("--child", choices=("legacy", "tuned"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.writers, args.requests)
+        return
+
+    for mode in ("legacy", "tuned"):
+        if args.url and mode == "legacy":
+            continue
+        with tempfile.TemporaryDirectory(prefix="bench-db-") as tmp:
+            env = dict(os.environ, DATABASE_URL=args.url or f"sqlite:///{tmp}/bench.db", LLM_CACHE_DIR="",
+                       PDF_EDGE_CACHE_DIR=os.path.join(tmp, "edge"))
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", mode,
+                 "--writers", str(args.writers), "--requests", str(args.requests)],
+                cwd=ROOT, env=env, stdout=subprocess.PIPE, check=True,
+            ).stdout.decode().strip().splitlines()[-1]
+        r = json.loads(out)
+        print(f"{mode:7s} writers={args.writers} requests={r['requests']} errors={r['errors']} "
+              f"throughput={r['throughput']:.0f}/s p50={r['p50']:.1f}ms p99={r['p99']:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Compares the two pdflatex modes over a corpus of sample CompleteResume payloads:
+
+  always-2   the old behaviour, two passes per document
+  on-demand  one pass, a second only if the .log asks for it (needs_rerun)
+
+Each document is compiled in a fresh temp dir with a cold pdflatex, so the
+numbers isolate the pass count from the warm pool.
+
+    SECRET_KEY=x python scripts/bench_latex_passes.py [--docs 20] [--repeat 3]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import schemas  # noqa: E402
+from helpers.latex_engine import MAX_PASSES, needs_rerun  # noqa: E402
+from latex_template import generate_latex_from_complete_resume  # noqa: E402
+
+
+def sample_resume(seed: int) -> schemas.CompleteResume:
+    n = 2 + seed % 5  # 2..6 entries per section
+    text = "Built and shipped features used by {k} customers; cut p95 latency by {k}%."
+    return schemas.CompleteResume(
+        general=schemas.GeneralRead(id=1, fullName=f"Sample Person {seed}", occupation="Software Engineer",
+                                    location="Berlin", about="Backend engineer. " * (1 + seed % 4)),
+        workExperience=[
+            schemas.WorkExperienceRead(id=i, title="Engineer", company=f"Company {i}", location="Remote",
+                                       startDate="2019", endDate="2022",
+                                       description="\n".join(text.format(k=i * j + 3) for j in range(3)))
+            for i in range(n)
+        ],
+        projects=[
+            schemas.ProjectRead(id=i, title=f"Project {i}", stack="Python, FastAPI",
+                                description=text.format(k=i + 7))
+            for i in range(n)
+        ],
+        education=[schemas.EducationRead(id=1, institution="University", degree="BSc", startDate="2014",
+                                         endDate="2018", location="Almaty")],
+        achievements=[schemas.AchievementRead(id=i, title=f"Award {i}", startDate="2020") for i in range(n // 2)],
+        skills=[schemas.SkillRead(id=i, category=f"Category {i}", stack="Python, SQL, Go") for i in range(3)],
+        contacts=[schemas.ContactRead(id=1, media="github", link="https://github.com/sample")],
+    )
+
+
+def compile_once(latex_src: str, mode: str) -> tuple[float, int]:
+    with tempfile.TemporaryDirectory(prefix="bench-latex-") as tmpdir:
+        with open(os.path.join(tmpdir, "resume.tex"), "w", encoding="utf-8") as f:
+            f.write(latex_src)
+        started = time.perf_counter()
+        passes = 0
+        for _ in range(MAX_PASSES):
+            subprocess.run(["pdflatex", "-interaction=nonstopmode", "resume.tex"],
+                           cwd=tmpdir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+            passes += 1
+            if mode == "always-2":
+                if passes == 2:
+                    break
+            else:
+                with open(os.path.join(tmpdir, "resume.log"), encoding="utf-8", errors="ignore") as f:
+                    if not needs_rerun(f.read()):
+                        break
+        return time.perf_counter() - started, passes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = [generate_latex_from_complete_resume(sample_resume(i)) for i in range(args.docs)]
+    for mode in ("always-2", "on-demand"):
+        timings, passes = [], []
+        for _ in range(args.repeat):
+            for src in corpus:
+                elapsed, n = compile_once(src, mode)
+                timings.append(elapsed * 1000)
+                passes.append(n)
+        timings.sort()
+        print(f"{mode:10s} docs={len(corpus)} runs={len(timings)} "
+              f"median={statistics.median(timings):.0f}ms p95={timings[int(len(timings) * 0.95) - 1]:.0f}ms "
+              f"avg_passes={statistics.mean(passes):.2f}")
+
+
+if __name__ == "__main__":
+    main()
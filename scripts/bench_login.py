@@ -0,0 +1,103 @@
+"""
+Login storm load test: many clients POST /auth/login at once through the
+ASGI app while a probe keeps calling a sync route (GET /users/me), which
+shares the anyio threadpool with the rest of the CRUD API.
+
+Reports p50/p99 login latency, how many logins were shed with 429, and the
+probe's p99 -- the latter shows whether waiting on bcrypt holds threads.
+
+Runs on a temp SQLite file, so the app database is never touched.
+
+    SECRET_KEY=x python scripts/bench_login.py [--clients 200] [--rounds 12]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _p(values, q):
+    values = sorted(values)
+    return values[max(0, int(len(values) * q) - 1)] if values else 0.0
+
+
+async def storm(app, clients: int, token: str) -> None:
+    import httpx
+    from database import dispose_async_engine
+
+    logins, statuses, probes = [], {}, []
+    done = asyncio.Event()
+
+    async def login(client):
+        started = time.perf_counter()
+        r = await client.post("/auth/login", data={"username": "bench@example.com", "password": "secret-pass"})
+        logins.append((time.perf_counter() - started) * 1000)
+        statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+
+    async def probe(client):
+        while not done.is_set():
+            started = time.perf_counter()
+            await client.get("/users/me", headers={"Authorization": f"Bearer {token}"})
+            probes.append((time.perf_counter() - started) * 1000)
+            await asyncio.sleep(0.01)
+
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        probe_task = asyncio.create_task(probe(client))
+        started = time.perf_counter()
+        await asyncio.gather(*(login(client) for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await probe_task
+    await dispose_async_engine()
+
+    print(f"logins={clients} in {elapsed:.1f}s statuses={dict(sorted(statuses.items()))}")
+    print(f"login   p50={statistics.median(logins):.0f}ms p99={_p(logins, 0.99):.0f}ms")
+    print(f"probe   n={len(probes)} p50={statistics.median(probes):.1f}ms p99={_p(probes, 0.99):.1f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=None, help="BCRYPT_ROUNDS (default: settings)")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench-login-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/bench.db"
+    os.environ.setdefault("PDF_EDGE_CACHE_DIR", os.path.join(tmp, "edge"))
+    if args.rounds:
+        os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    os.chdir(ROOT)
+    sys.path.insert(0, str(ROOT))
+
+    import main as app_main
+    import models
+    from database import SessionLocal
+    from helpers.passwords import _hash
+    from utils import create_access_token, password_hasher
+
+    db = SessionLocal()
+    user = models.User(email="bench@example.com", username="bench",
+                       hashed_password=_hash("secret-pass", password_hasher.rounds))
+    db.add(user)
+    db.commit()
+    token = create_access_token(data={"sub": str(user.id)})
+    db.close()
+
+    print(f"bcrypt rounds={password_hasher.rounds} workers={password_hasher.workers}")
+    try:
+        asyncio.run(storm(app_main.app, args.clients, token))
+    finally:
+        password_hasher.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Highlight-phrase lookup on long PDFs with many notes: the old loop
+(page.search_for(phrase) on every page, per note) against PdfPhraseIndex
+(words extracted once, all phrases resolved from the token index).
+
+A third of the notes are quoted verbatim, a third wrap onto the next line
+and a third carry a typo, so the hit counts show what each approach finds.
+Every page also has a "Python/Django, Kafka/RabbitMQ" stack line; notes that
+quote one of those names, or only part of a word ("ngineers"), are added on
+top and must hit at least as often as with search_for. --unmatched adds notes
+quoting text the PDF does not contain, as a model that paraphrases does; they
+must not send the index back to scanning every page.
+
+    SECRET_KEY=x python scripts/bench_pdf_locator.py [--pages 20] [--notes 16] [--unmatched 32] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import fitz  # noqa: E402
+
+from helpers.pdf_locator import PdfPhraseIndex  # noqa: E402
+
+SKILLS = ["Python", "Kubernetes", "PostgreSQL", "Terraform", "GraphQL", "Airflow", "Kafka", "React"]
+STACK_LINE = "Stack: Python/Django, Kafka/RabbitMQ, real-time APIs for Engineers"
+STACK_NOTES = ["Django", "RabbitMQ", "Kafka", "ngineers", "real-time APIs"]
+
+
+def sample_pdf(pages: int) -> bytes:
+    doc = fitz.open()
+    for p in range(pages):
+        page = doc.new_page()
+        page.insert_text((50, 45), STACK_LINE, fontsize=9)
+        y = 60
+        for i in range(40):
+            skill = SKILLS[(p + i) % len(SKILLS)]
+            if i % 10 == 9:
+                # a phrase that wraps onto the next line
+                page.insert_text((50, y), f"Owned the data pipeline in {skill} for", fontsize=9)
+                y += 13
+                page.insert_text((50, y), f"reporting team {p}-{i}, reducing cost", fontsize=9)
+            else:
+                page.insert_text((50, y), f"Item {p}-{i}: built {skill} services handling {i * 7}k requests/day",
+                                 fontsize=9)
+            y += 15
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def unmatched_notes(count: int) -> list[str]:
+    return [f"Led migration of {n} COBOL mainframes to Rust microservices" for n in range(count)]
+
+
+def sample_notes(count: int) -> list[str]:
+    notes = []
+    for n in range(count):
+        p, i = n % 3, 9 + 10 * (n % 4)
+        skill = SKILLS[(p + i) % len(SKILLS)]
+        kind = n % 3
+        if kind == 0:
+            notes.append(f"built {SKILLS[(n + 2) % len(SKILLS)]} services handling")
+        elif kind == 1:
+            notes.append(f"pipeline in {skill} for reporting team {p}-{i}")
+        else:
+            notes.append(f"data pipeline in {skill[:2] + skill[3] + skill[2] + skill[4:]}")  # swapped letters
+    return notes + STACK_NOTES
+
+
+def old_loop(pdf_bytes: bytes, notes: list[str], max_pages: int) -> int:
+    hits = 0
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+        for phrase in notes:
+            for page_num in range(min(doc.page_count, max_pages)):
+                hits += len(doc[page_num].search_for(phrase[:64]))
+    return hits
+
+
+def word_index(pdf_bytes: bytes, notes: list[str], max_pages: int) -> int:
+    index = PdfPhraseIndex(pdf_bytes, max_pages)
+    try:
+        found = index.locate_all(notes)
+        return sum(len(found[phrase]) for phrase in notes)
+    finally:
+        index.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--notes", type=int, default=16)
+    parser.add_argument("--unmatched", type=int, default=32)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    pdf_bytes = sample_pdf(args.pages)
+    notes = sample_notes(args.notes) + unmatched_notes(args.unmatched)
+    print(f"{args.pages} pages, {len(notes)} notes ({args.unmatched} not in the PDF)")
+    for name, run in (("search_for", old_loop), ("word-index", word_index)):
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            hits = run(pdf_bytes, notes, args.pages)
+            timings.append((time.perf_counter() - started) * 1000)
+        print(f"{name:10s} median={statistics.median(timings):.0f}ms min={min(timings):.0f}ms "
+              f"highlight rects={hits}")
+
+    # notes the index finds less often than search_for did
+    for phrase in dict.fromkeys(notes):
+        old, new = old_loop(pdf_bytes, [phrase], args.pages), word_index(pdf_bytes, [phrase], args.pages)
+        if new < old:
+            print(f"  fewer hits: {phrase!r} search_for={old} word-index={new}")
+
+
+if __name__ == "__main__":
+    main()
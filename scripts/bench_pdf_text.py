@@ -0,0 +1,88 @@
+"""
+Throughput and text fidelity of the PDF text extraction backends
+(helpers/pdf_text.EXTRACTORS) over a corpus of PDFs.
+
+Fidelity is the word-set overlap (Jaccard) with the known text of the
+generated samples; for real files passed with --dir, where the text is
+unknown, each backend is compared with pdfminer instead.
+
+    SECRET_KEY=x python scripts/bench_pdf_text.py [--docs 20] [--pages 3] [--dir path/to/pdfs]
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import fitz  # noqa: E402
+
+from helpers.pdf_text import EXTRACTORS  # noqa: E402
+
+_WORDS = re.compile(r"\w+")
+
+
+def words(text: str) -> set:
+    return set(_WORDS.findall(text.lower()))
+
+
+def jaccard(a: set, b: set) -> float:
+    return len(a & b) / len(a | b) if a | b else 1.0
+
+
+def sample_pdf(seed: int, pages: int) -> tuple[bytes, str]:
+    doc = fitz.open()
+    lines = []
+    for p in range(pages):
+        page = doc.new_page()
+        y = 60
+        for i in range(45):
+            line = f"Entry {seed}-{p}-{i}: led migration of service{i} to Kubernetes, cutting cost {i * 3}%"
+            page.insert_text((50, y), line, fontsize=9)
+            lines.append(line)
+            y += 15
+    data = doc.tobytes()
+    doc.close()
+    return data, "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--dir", help="use the PDFs in this directory instead of generated samples")
+    args = parser.parse_args()
+
+    if args.dir:
+        corpus = [(p.read_bytes(), None) for p in sorted(Path(args.dir).glob("*.pdf"))]
+    else:
+        corpus = [sample_pdf(i, args.pages) for i in range(args.docs)]
+    total_mb = sum(len(data) for data, _ in corpus) / 1e6
+    print(f"{len(corpus)} PDFs, {total_mb:.1f} MB")
+
+    outputs = {}
+    for name, extract in EXTRACTORS.items():
+        timings, texts = [], []
+        for data, _ in corpus:
+            started = time.perf_counter()
+            texts.append(extract(data))
+            timings.append((time.perf_counter() - started) * 1000)
+        outputs[name] = texts
+        total = sum(timings) / 1000
+        print(f"{name:9s} total={total:.2f}s median={statistics.median(timings):.1f}ms "
+              f"docs/s={len(corpus) / total:.1f}")
+
+    for name, texts in outputs.items():
+        refs = [truth if truth is not None else ref
+                for (_, truth), ref in zip(corpus, outputs["pdfminer"])]
+        scores = [jaccard(words(t), words(r)) for t, r in zip(texts, refs)]
+        basis = "pdfminer" if args.dir else "source text"
+        print(f"{name:9s} fidelity vs {basis}: mean={statistics.mean(scores):.3f} min={min(scores):.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+import models
+from database import Base
+from helpers import resume as resume_helpers
+from helpers.resume_cache import ResumeSnapshotCache
+
+
+@pytest.fixture
+def db():
+    async def setup():
+        engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        return engine
+
+    loop = asyncio.new_event_loop()
+    engine = loop.run_until_complete(setup())
+    session = AsyncSession(engine, expire_on_commit=False)
+    yield loop, session
+    loop.run_until_complete(session.close())
+    loop.run_until_complete(engine.dispose())
+    loop.close()
+
+
+def _seed(loop, session) -> models.General:
+    user = models.User(username="owner", email="owner@example.com")
+    session.add(user)
+    loop.run_until_complete(session.flush())
+    general = models.General(user_id=user.id, fullName="Before")
+    session.add(general)
+    loop.run_until_complete(session.commit())
+    return general
+
+
+def test_invalidation_in_one_worker_does_not_leave_owner_reads_stale(db, monkeypatch):
+    loop, session = db
+    general = _seed(loop, session)
+    worker_a = ResumeSnapshotCache(max_users=8, ttl=60)
+    worker_b = ResumeSnapshotCache(max_users=8, ttl=60)
+
+    # both workers have served the public profile once
+    for cache in (worker_a, worker_b):
+        monkeypatch.setattr(resume_helpers, "resume_snapshots", cache)
+        public = loop.run_until_complete(resume_helpers.get_public_resume_async(general.user_id, session))
+        assert public.general.fullName == "Before"
+
+    # the owner edits through worker A, which invalidates only its own cache
+    general.fullName = "After"
+    loop.run_until_complete(session.commit())
+    worker_a.invalidate(general.user_id)
+
+    # worker B still holds the old public snapshot until its TTL runs out ...
+    monkeypatch.setattr(resume_helpers, "resume_snapshots", worker_b)
+    assert worker_b.get(general.user_id, False).general.fullName == "Before"
+    # ... but the owner's own reads on worker B bypass it
+    owner = loop.run_until_complete(resume_helpers.get_complete_resume_async(general.user_id, session))
+    assert owner.general.fullName == "After"
+
+    monkeypatch.setattr(resume_helpers, "resume_snapshots", worker_a)
+    public = loop.run_until_complete(resume_helpers.get_public_resume_async(general.user_id, session))
+    assert public.general.fullName == "After"
@@ -7,10 +7,14 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from fastapi import Request, HTTPException, status
 from fastapi.security.oauth2 import OAuth2, OAuthFlowsModel
-from sqlalchemy.orm import Session
-from passlib.context import CryptContext
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
 from jose import JWTError, jwt
-from database import get_db
+from config import settings
+from database import get_async_db, get_db
+from helpers.passwords import HashingBusy, PasswordHasher
+from helpers.ttl_cache import TTLCache
 from models import User
 
 
@@ -25,12 +29,38 @@ ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 10080
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 # ---------------------- Подготовка паролей (passlib) ----------------------
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+# bcrypt runs in a separate process pool; 429 once it is saturated
+password_hasher = PasswordHasher(
+    rounds=settings.BCRYPT_ROUNDS,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
+
+
+def _hashing_busy_exc() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many authentication requests, retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+async def get_password_hash(password: str) -> str:
+    try:
+        return await password_hasher.hash(password)
+    except HashingBusy:
+        raise _hashing_busy_exc()
+
+
+async def verify_password_and_update(plain_password, hashed_password) -> tuple[bool, Optional[str]]:
+    """
+    (ok, new_hash): new_hash is set when the stored hash uses another BCRYPT_ROUNDS.
+    """
+    try:
+        return await password_hasher.verify_and_update(plain_password, hashed_password)
+    except HashingBusy:
+        raise _hashing_busy_exc()
 
-def verify_password(plain_password, hashed_password) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -42,21 +72,101 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-) -> User:
-    credentials_exc = HTTPException(
+def _credentials_exc() -> HTTPException:
+    return HTTPException(
         status_code=401, detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def _user_id_from_token(token: str) -> int:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        uid = int(payload.get("sub"))
+        return int(payload.get("sub"))
     except (JWTError, ValueError, TypeError):
-        raise credentials_exc
+        raise _credentials_exc()
+
+
+# ---------------------- Кэш пользователей (principal cache) ----------------------
+class _PrincipalCache:
+    """
+    Short-lived column snapshots of User rows keyed by id, so authenticated
+    requests skip the per-request SELECT. Handlers that modify a User must
+    call forget_principal(); the TTL bounds staleness across workers.
+    """
+
+    def __init__(self, max_items: int, ttl: int):
+        self.max_items = max_items
+        self.ttl = ttl
+        self._items: TTLCache[int, dict] = TTLCache(max_items, ttl)
+
+    def get(self, uid: int) -> Optional[dict]:
+        return self._items.get(uid)
+
+    def put(self, user: User) -> None:
+        values = {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+        self._items.put(user.id, values)
+
+    def forget(self, uid: int) -> None:
+        self._items.pop(uid)
+
+
+_principals = _PrincipalCache(settings.PRINCIPAL_CACHE_MAX_ITEMS, settings.PRINCIPAL_CACHE_TTL)
+
+
+def forget_principal(uid: int) -> None:
+    _principals.forget(uid)
+
+
+def _detached_user(values: dict) -> User:
+    # Rebuild the row as if it had just been loaded; merge(load=False) then
+    # attaches it to the request session without a SELECT, so handlers can
+    # still modify and commit current_user as before.
+    user = User(**values)
+    make_transient_to_detached(user)
+    return user
+
+
+def get_current_user_id(token: str = Depends(oauth2_scheme)) -> int:
+    """
+    Claims-only dependency: validates the JWT and returns the user id without
+    touching the database. For endpoints that only filter by the owner id.
+    """
+    return _user_id_from_token(token)
+
+
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+) -> User:
+    uid = _user_id_from_token(token)
+
+    cached = _principals.get(uid)
+    if cached is not None:
+        return db.merge(_detached_user(cached), load=False)
 
     user = db.query(User).get(uid)
     if not user:
-        raise credentials_exc
+        raise _credentials_exc()
+    _principals.put(user)
+    return user
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> User:
+    """
+    Same as get_current_user, for async endpoints running on AsyncSession.
+    """
+    uid = _user_id_from_token(token)
+
+    cached = _principals.get(uid)
+    if cached is not None:
+        return await db.merge(_detached_user(cached), load=False)
+
+    user = await db.get(User, uid)
+    if not user:
+        raise _credentials_exc()
+    _principals.put(user)
     return user